@@ -0,0 +1,29 @@
+"""
+Run the API with Uvicorn: `python -m app`.
+
+Server options (host, port, workers, event loop, HTTP parser) come from settings.
+"""
+
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def main() -> None:
+    """Start Uvicorn with uvloop + httptools and one worker per CPU by default."""
+    uvicorn.run(
+        # Import string, required by Uvicorn to spawn several workers
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS or (os.cpu_count() or 1),
+        loop=settings.LOOP,
+        http=settings.HTTP_PARSER,
+        log_level=settings.LOG_LEVEL,
+    )
+
+
+if __name__ == "__main__":
+    main()
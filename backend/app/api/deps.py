@@ -0,0 +1,92 @@
+"""
+Shared API dependencies.
+"""
+
+from fastapi import HTTPException, Request, Response
+
+from app.core.config import settings
+from app.models.requests import SearchRequest
+from app.services.data_registry import get_data_registry
+
+# Cache policy for responses that only change with the data files
+STATIC_CACHE_CONTROL = "public, max-age=300"
+
+
+async def get_search_request(request: SearchRequest) -> SearchRequest:
+    """
+    Parse and validate the search request body.
+
+    Endpoints depend on this instead of declaring the body directly, so the
+    body is parsed once per request and cached for any sub-dependency.
+    Cross-field validation lives in SearchRequest itself. Declared async so
+    this trivial dependency does not take a threadpool hop.
+    """
+    return request
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the API version, the data version and extra parts.
+
+    Extra parts distinguish variants of the same resource (query parameters,
+    content encoding).
+    """
+    version = get_data_registry().get_data_version()
+    return '"' + "-".join(str(p) for p in (settings.VERSION, version, *parts)) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    Check whether an Accept-Encoding header value accepts gzip.
+
+    Honors q-values: gzip (or the `*` wildcard when gzip is not listed) is
+    accepted unless its q is 0.
+    """
+    if not accept_encoding:
+        return False
+
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+async def cached_by_data_version(request: Request, response: Response) -> None:
+    """
+    Conditional GET for responses that only depend on the data files.
+
+    Answers 304 Not Modified when the client already has the current version,
+    otherwise adds ETag and Cache-Control headers to the response.
+    """
+    etag = make_etag()
+    headers = {"ETag": etag, "Cache-Control": STATIC_CACHE_CONTROL}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+
+    response.headers.update(headers)
@@ -2,8 +2,10 @@
 Communes endpoints - CRUD and search operations.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from app.api.deps import get_search_request
+from app.core.responses import ORJSONResponse
 from app.models.commune import CommuneDetail, CommuneSummary
 from app.models.requests import SearchRequest
 from app.models.responses import PaginatedResponse, SearchResponse
@@ -14,6 +16,12 @@ router = APIRouter()
 # Service instance (will be replaced with dependency injection when DB is ready)
 commune_service = CommuneService()
 
+# Hot list endpoints return an ORJSONResponse directly: FastAPI then skips
+# jsonable_encoder and response_model validation. The response_model is kept
+# on the decorator for the OpenAPI schema only.
+# Handlers are sync (`def`) so FastAPI runs the CPU-bound service calls in its
+# threadpool instead of blocking the event loop.
+
 
 @router.get(
     "",
@@ -21,24 +29,34 @@ commune_service = CommuneService()
     summary="Liste des communes",
     description="Retourne la liste paginée des communes avec leurs scores.",
 )
-async def list_communes(
+def list_communes(
     limit: int = Query(default=50, ge=1, le=500, description="Nombre de résultats par page"),
     offset: int = Query(default=0, ge=0, description="Index de départ"),
     sort_by: str = Query(default="score_global", description="Champ de tri"),
     order: str = Query(default="desc", pattern="^(asc|desc)$", description="Ordre de tri"),
-) -> PaginatedResponse[CommuneSummary]:
+    cursor: str | None = Query(
+        default=None,
+        description="Curseur de pagination (next_cursor de la page précédente)",
+    ),
+) -> ORJSONResponse:
     """
     List all communes with pagination.
 
     Communes are returned with their summary information and global score.
+    Prefer the `cursor` (keyset pagination) over large offsets.
     """
-    result = await commune_service.list_communes(
-        limit=limit,
-        offset=offset,
-        sort_by=sort_by,
-        order=order,
-    )
-    return result
+    try:
+        result = commune_service.list_communes(
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+            order=order,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ORJSONResponse(result)
 
 
 @router.get(
@@ -47,13 +65,13 @@ async def list_communes(
     summary="Détail d'une commune",
     description="Retourne les informations détaillées d'une commune avec tous ses scores.",
 )
-async def get_commune(code_insee: str) -> CommuneDetail:
+def get_commune(code_insee: str) -> CommuneDetail:
     """
     Get detailed information for a single commune.
 
     Returns all available data including individual category scores.
     """
-    commune = await commune_service.get_commune(code_insee)
+    commune = commune_service.get_commune(code_insee)
 
     if commune is None:
         raise HTTPException(
@@ -70,12 +88,14 @@ async def get_commune(code_insee: str) -> CommuneDetail:
     summary="Recherche de communes",
     description="Recherche de communes selon des critères multiples avec pondération personnalisée.",
 )
-async def search_communes(request: SearchRequest) -> SearchResponse:
+def search_communes(
+    request: SearchRequest = Depends(get_search_request),
+) -> ORJSONResponse:
     """
     Search communes with custom weights and filters.
 
     The global score is recalculated using the provided weights.
     Results can be filtered by location, population, and other criteria.
     """
-    result = await commune_service.search_communes(request)
-    return result
+    result = commune_service.search_communes(request)
+    return ORJSONResponse(result)
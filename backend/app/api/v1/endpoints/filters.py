@@ -4,19 +4,24 @@ Filters endpoints - filter options and metadata.
 
 from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
+from app.api.deps import cached_by_data_version
 from app.models.filters import FilterOptions
 from app.services.commune_service import CommuneService
 from app.services.filter_service import FilterService
 
-router = APIRouter()
+# Filter metadata only changes with the data files: served with ETag/304
+router = APIRouter(dependencies=[Depends(cached_by_data_version)])
 
 # Service instances
 filter_service = FilterService()
 commune_service = CommuneService()
 
+# Options, categories and defaults are in-memory lookups and stay on the event
+# loop; data-status stats dataset files, so it is a sync handler (threadpool).
+
 
 class FilterCategory(BaseModel):
     """Filter category with metadata."""
@@ -60,7 +65,7 @@ async def get_filter_options() -> FilterOptions:
     Returns ranges for numerical filters and lists for categorical filters.
     This data is used to populate the filter UI.
     """
-    return await filter_service.get_filter_options()
+    return filter_service.get_filter_options()
 
 
 @router.get(
@@ -76,9 +81,11 @@ async def get_filter_categories() -> FilterCategoriesResponse:
     Returns filter definitions with name, description, icon, and default weight.
     These are dynamically loaded from the manifest.json and available datasets.
     """
-    categories = await filter_service.get_filter_categories()
-    return FilterCategoriesResponse(
-        categories=[FilterCategory(**c) for c in categories],
+    categories = filter_service.get_filter_categories()
+    # Built from the registry's own definitions: skip validation here, the
+    # response is validated against response_model when serialized
+    return FilterCategoriesResponse.model_construct(
+        categories=[FilterCategory.model_construct(**c) for c in categories],
         count=len(categories),
     )
 
@@ -94,7 +101,7 @@ async def get_default_weights() -> dict[str, int]:
 
     Returns dict of filter_id -> default weight (0-100).
     """
-    return await filter_service.get_default_weights()
+    return filter_service.get_default_weights()
 
 
 @router.get(
@@ -103,13 +110,13 @@ async def get_default_weights() -> dict[str, int]:
     summary="État des données",
     description="Retourne l'état de disponibilité des sources de données.",
 )
-async def get_data_status() -> DataStatusResponse:
+def get_data_status() -> DataStatusResponse:
     """
     Get status of available data sources.
 
     Shows which datasets are available and if the app is ready to display data.
     """
-    status = await commune_service.get_data_status()
+    status = commune_service.get_data_status()
     return DataStatusResponse(
         communes_available=status["communes_available"],
         communes_file=status["communes_file"],
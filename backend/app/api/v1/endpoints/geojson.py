@@ -2,9 +2,18 @@
 GeoJSON endpoints - geographic data for map rendering.
 """
 
-from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
+from typing import Literal
 
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.api.deps import (
+    STATIC_CACHE_CONTROL,
+    accepts_gzip,
+    etag_matches,
+    get_search_request,
+    make_etag,
+)
 from app.models.geojson import CommunesGeoJSON
 from app.models.requests import SearchRequest
 from app.services.geojson_service import GeoJSONService
@@ -14,6 +23,9 @@ router = APIRouter()
 # Service instance
 geojson_service = GeoJSONService()
 
+# Geometry processing and serialization are CPU-bound: handlers are plain `def`
+# so they run in the threadpool.
+
 
 @router.get(
     "/communes",
@@ -21,25 +33,72 @@ geojson_service = GeoJSONService()
     summary="GeoJSON des communes",
     description="Retourne les données géographiques des communes au format GeoJSON.",
 )
-async def get_communes_geojson(
+def get_communes_geojson(
+    request: Request,
     min_score: float = Query(default=0, ge=0, le=100, description="Score minimum"),
     simplified: bool = Query(default=True, description="Géométries simplifiées pour performance"),
-) -> JSONResponse:
+    format: Literal["geojson", "ndgeojson"] = Query(
+        default="geojson",
+        description="FeatureCollection (geojson) ou une Feature par ligne en flux (ndgeojson)",
+    ),
+) -> Response:
     """
     Get communes as GeoJSON for map rendering.
 
     Returns a FeatureCollection with commune polygons and properties.
     Use simplified=true for better performance with many communes.
+    The serialized payload is cached by the service; clients accepting gzip
+    get the pre-compressed variant (GZipMiddleware passes it through as is),
+    read from the file exported at startup when there is no score filter.
+    Supports conditional requests (ETag / If-None-Match).
+    With format=ndgeojson, features are streamed one per line instead.
     """
-    geojson = await geojson_service.get_communes_geojson(
-        min_score=min_score,
-        simplified=simplified,
-    )
+    if format == "ndgeojson":
+        return StreamingResponse(
+            geojson_service.iter_communes_ndgeojson(
+                min_score=min_score,
+                simplified=simplified,
+            ),
+            media_type="application/x-ndjson",
+        )
 
-    return JSONResponse(
-        content=geojson.model_dump(),
-        media_type="application/geo+json",
-    )
+    gzipped = accepts_gzip(request.headers.get("accept-encoding"))
+    etag = make_etag(int(simplified), f"{min_score:g}", "gzip" if gzipped else "identity")
+    headers = {
+        "Vary": "Accept-Encoding",
+        "ETag": etag,
+        "Cache-Control": STATIC_CACHE_CONTROL,
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+
+        # Unfiltered map: stream the file exported at startup straight from disk
+        # (falls back to the in-memory payload if the file was removed since)
+        exported_path = (
+            geojson_service.get_exported_gzip_path(simplified) if min_score == 0 else None
+        )
+        if exported_path is not None and exported_path.is_file():
+            return FileResponse(
+                exported_path,
+                media_type="application/geo+json",
+                headers=headers,
+            )
+
+        payload = geojson_service.get_communes_geojson_gzip(
+            min_score=min_score,
+            simplified=simplified,
+        )
+    else:
+        payload = geojson_service.get_communes_geojson_bytes(
+            min_score=min_score,
+            simplified=simplified,
+        )
+
+    return Response(content=payload, media_type="application/geo+json", headers=headers)
 
 
 @router.post(
@@ -48,21 +107,20 @@ async def get_communes_geojson(
     summary="GeoJSON filtré des communes",
     description="Retourne les données géographiques des communes filtrées.",
 )
-async def get_filtered_communes_geojson(
-    request: SearchRequest,
+def get_filtered_communes_geojson(
+    request: SearchRequest = Depends(get_search_request),
     simplified: bool = Query(default=True, description="Géométries simplifiées"),
-) -> JSONResponse:
+) -> Response:
     """
     Get filtered communes as GeoJSON.
 
     Same as the regular search but returns GeoJSON format for direct map use.
+    Features are streamed batch by batch instead of being built in memory.
     """
-    geojson = await geojson_service.get_filtered_communes_geojson(
-        request=request,
-        simplified=simplified,
-    )
-
-    return JSONResponse(
-        content=geojson.model_dump(),
+    return StreamingResponse(
+        geojson_service.iter_filtered_communes_geojson(
+            request=request,
+            simplified=simplified,
+        ),
         media_type="application/geo+json",
     )
@@ -2,38 +2,89 @@
 Health check endpoint.
 """
 
+import time
 from datetime import UTC, datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from starlette.types import Receive, Scope, Send
 
 from app.core.config import settings
+from app.core.responses import orjson_dumps
 from app.models.responses import HealthResponse
 
 router = APIRouter()
 
+# Health payload serialized once; only the timestamp changes between calls.
+# TODO: Add database and Redis health checks (build the payload per call then)
+_HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "version": settings.VERSION,
+    "timestamp": "__TIMESTAMP__",
+    "services": {
+        "api": "healthy",
+        "database": "not_configured",
+        "cache": "not_configured",
+    },
+}
+_HEALTH_TEMPLATE = (
+    orjson_dumps(_HEALTH_PAYLOAD).replace(b"%", b"%%").replace(b'"__TIMESTAMP__"', b'"%b"')
+)
+
+# (unix second, serialized payload) of the last health check
+_body_cache: tuple[int, bytes] = (0, b"")
+
+
+def _health_body() -> bytes:
+    """
+    Get the serialized health payload, with a second-resolution UTC timestamp.
+
+    The payload is rebuilt at most once per second.
+    """
+    global _body_cache
+    now = int(time.time())
+    if _body_cache[0] != now:
+        timestamp = datetime.fromtimestamp(now, UTC).isoformat()
+        _body_cache = (now, _HEALTH_TEMPLATE % timestamp.encode())
+    return _body_cache[1]
+
+
+def _health_response() -> Response:
+    """Build the health check response, served by health_asgi and documented by health_check."""
+    return Response(
+        content=_health_body(),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
 
+
+class HealthASGIApp:
+    """
+    Minimal ASGI app answering health checks.
+
+    Registered ahead of the API routes (see app.main), so probes skip route
+    matching, dependency resolution and response validation.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await _health_response()(scope, receive, send)
+
+
+health_asgi = HealthASGIApp()
+
+
+# OpenAPI documentation: requests to this path are answered by health_asgi,
+# which is matched first. Both build their response with _health_response(),
+# so the documented and served responses cannot drift apart.
 @router.get(
     "",
     response_model=HealthResponse,
     summary="Vérification de l'état de l'API",
     description="Retourne l'état de santé de l'API et des services connectés.",
 )
-async def health_check() -> HealthResponse:
+async def health_check() -> Response:
     """
     Check API health status.
 
     Returns current health status, version, and timestamp.
     """
-    # TODO: Add database health check
-    # TODO: Add Redis health check
-
-    return HealthResponse(
-        status="healthy",
-        version=settings.VERSION,
-        timestamp=datetime.now(UTC).isoformat(),
-        services={
-            "api": "healthy",
-            "database": "not_configured",
-            "cache": "not_configured",
-        },
-    )
+    return _health_response()
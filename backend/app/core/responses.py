@@ -0,0 +1,35 @@
+"""
+Custom response classes using orjson for fast serialization.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+def orjson_default(obj: Any) -> Any:
+    """Serialize values that orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, datetime | date | time):
+        return obj.isoformat()
+    return str(obj)
+
+
+def orjson_dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with the application's orjson options."""
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(Response):
+    """JSON response serialized with orjson (numpy arrays supported)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
@@ -3,7 +3,7 @@ Commune data models.
 
 Scores are now dynamic - keys are filter IDs from the manifest.
 """
-
+from dataclasses import dataclass
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -42,6 +42,30 @@ class CommuneSummary(BaseModel):
     coordinates: Coordinates = Field(..., description="Coordonnées")
 
 
+@dataclass(slots=True, frozen=True)
+class CoordinatesRecord:
+    """Lightweight coordinates record, serialized natively by orjson."""
+
+    lat: float
+    lng: float
+
+
+@dataclass(slots=True, frozen=True)
+class CommuneSummaryRecord:
+    """
+    Lightweight commune summary used on the list/search hot paths.
+
+    Same fields as CommuneSummary, without per-instance validation or
+    `__dict__`. The Pydantic model stays the documented response schema.
+    """
+
+    code_insee: str
+    nom: str
+    departement: str
+    score_global: float
+    coordinates: CoordinatesRecord
+
+
 class CommuneDetail(CommuneBase):
     """Detailed commune information with all scores."""
 
@@ -1,5 +1,9 @@
 """
 GeoJSON models for map data.
+
+These models document the response schema (OpenAPI). The GeoJSON service
+builds the payload from plain dicts and serialized geometries instead of
+instantiating them per feature.
 """
 
 from typing import Any, Literal
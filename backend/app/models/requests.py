@@ -4,7 +4,9 @@ Request models for API endpoints.
 Weights are now dynamic - keys are filter IDs from manifest.
 """
 
-from pydantic import BaseModel, ConfigDict, Field
+from typing import Self
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class ViewportBounds(BaseModel):
@@ -91,3 +93,22 @@ class SearchRequest(BaseModel):
         ge=0,
         description="Index de départ",
     )
+
+    @model_validator(mode="after")
+    def check_consistency(self) -> Self:
+        """Validate cross-field constraints once, at request parsing."""
+        if (
+            self.population_min is not None
+            and self.population_max is not None
+            and self.population_min > self.population_max
+        ):
+            raise ValueError("population_min doit être inférieur ou égal à population_max")
+
+        if self.bounds is not None and self.bounds.south > self.bounds.north:
+            raise ValueError("bounds.south doit être inférieur ou égal à bounds.north")
+
+        for filter_id, weight in self.weights.items():
+            if not 0 <= weight <= 100:
+                raise ValueError(f"Le poids du filtre {filter_id} doit être compris entre 0 et 100")
+
+        return self
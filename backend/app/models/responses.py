@@ -33,6 +33,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
     limit: int = Field(..., ge=1, description="Limite par page")
     offset: int = Field(..., ge=0, description="Index de départ")
     has_more: bool = Field(..., description="Indique s'il y a plus de résultats")
+    next_cursor: str | None = Field(
+        default=None,
+        description="Curseur opaque de la page suivante (pagination par clé)",
+    )
 
 
 class SearchResponse(BaseModel):
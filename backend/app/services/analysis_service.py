@@ -4,13 +4,23 @@ Spatial analysis service.
 Provides high-level analysis operations combining multiple processors.
 """
 
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 import geopandas as gpd
+import numpy as np
+import orjson
 import pandas as pd
+import shapely
+from scipy.spatial import cKDTree
 
+from app.core.responses import orjson_dumps
 from app.data.layers import get_layer_registry
-from app.data.processors import RasterProcessor, ScoreProcessor, VectorProcessor
+from app.data.processors import RasterProcessor, ScoreProcessor
 
 
 class AnalysisService:
@@ -24,10 +34,153 @@ class AnalysisService:
     - Data export
     """
 
+    # Metric CRS used for distance computations (Lambert-93)
+    METRIC_CRS = "EPSG:2154"
+
+    # Maximum spacing between coastline vertices for nearest-vertex distances:
+    # bounds the error to half of it (250 m)
+    COAST_VERTEX_SPACING_METERS = 500.0
+
+    # Geometries per shapely.simplify call when simplifying in parallel
+    SIMPLIFY_CHUNK_SIZE = 4096
+
+    # Minimum number of communes for which zonal statistics rasterize all
+    # communes at once instead of masking the raster per commune
+    ZONAL_RASTERIZE_MIN_FEATURES = 64
+
+    # Maximum number of score results kept in memory (one per weight set)
+    SCORE_CACHE_SIZE = 4
+
     def __init__(self) -> None:
         """Initialize with global layer registry."""
         self.registry = get_layer_registry()
         self.score_processor = ScoreProcessor(self.registry)
+        # Per target layer: projected target parts and their spatial index
+        self._target_trees: dict[str, tuple[np.ndarray, shapely.STRtree]] = {}
+        # Per target layer: kd-tree over its (densified) vertices
+        self._vertex_trees: dict[str, cKDTree] = {}
+        # compute_all_scores results by weights hash, least recently used first
+        self._score_cache: OrderedDict[bytes, gpd.GeoDataFrame] = OrderedDict()
+        self._score_cache_fingerprint: str | None = None
+        # code INSEE index of cached results, built on first lookup
+        self._code_indexes: dict[bytes, pd.Index] = {}
+        # Communes layer, loaded once and shared by all analyses
+        self._communes: gpd.GeoDataFrame | None = None
+
+    def _get_communes_gdf(self) -> gpd.GeoDataFrame:
+        """
+        Get the communes GeoDataFrame, loaded once from the registry.
+
+        Reloaded only when a layer file changes. Shared between calls: do not
+        modify it in place.
+
+        Raises:
+            ValueError: If no communes layer is registered
+        """
+        self._refresh_score_caches()
+        if self._communes is not None:
+            return self._communes
+
+        communes_layer = self.registry.get_communes()
+        if communes_layer is None:
+            raise ValueError("No communes layer registered")
+
+        self._communes = communes_layer.load()
+        return self._communes
+
+    @staticmethod
+    def _distance_frame(
+        communes_gdf: gpd.GeoDataFrame,
+        column: str,
+        distances: np.ndarray,
+    ) -> pd.DataFrame:
+        """
+        Wrap distances aligned with communes_gdf into a code_insee / distance frame.
+
+        Built from the existing arrays without copying them; distances are
+        stored as float32 (sub-meter precision up to thousands of km).
+        """
+        return pd.DataFrame(
+            {
+                "code_insee": communes_gdf["code_insee"].to_numpy(),
+                column: distances.astype(np.float32, copy=False),
+            },
+            index=communes_gdf.index,
+            copy=False,
+        )
+
+    def _vectorized_distance(
+        self,
+        communes_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        layer_name: str,
+    ) -> np.ndarray:
+        """
+        Compute the distance from each commune to the nearest target geometry.
+
+        The target geometries are split into parts and indexed in an STRtree
+        once per layer. Each commune is paired with its nearest part
+        (STRtree.nearest), then all distances are computed in a single
+        shapely.distance call, without a Python loop over communes.
+
+        Args:
+            communes_gdf: Communes GeoDataFrame
+            target_gdf: Target geometries (e.g. coastline)
+            layer_name: Name of the target layer, used as cache key for the index
+
+        Returns:
+            Distances in meters, aligned with communes_gdf
+        """
+        cached = self._target_trees.get(layer_name)
+        if cached is None:
+            targets = shapely.get_parts(target_gdf.to_crs(self.METRIC_CRS).geometry.values)
+            cached = (targets, shapely.STRtree(targets))
+            self._target_trees[layer_name] = cached
+
+        targets, tree = cached
+        communes = np.asarray(communes_gdf.to_crs(self.METRIC_CRS).geometry.values)
+        nearest = tree.nearest(communes)
+
+        distances: np.ndarray = shapely.distance(communes, targets[nearest])
+        return distances
+
+    def _nearest_vertex_distance(
+        self,
+        communes_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        layer_name: str,
+    ) -> np.ndarray:
+        """
+        Compute the distance from each commune centroid to the nearest target vertex.
+
+        The target lines are densified (COAST_VERTEX_SPACING_METERS) and their
+        vertices indexed in a kd-tree once per layer; centroids are then
+        queried in bulk, in parallel. Suited to line targets such as the
+        coastline, where it is much faster than exact geometry distances.
+
+        Args:
+            communes_gdf: Communes GeoDataFrame
+            target_gdf: Target lines (e.g. coastline)
+            layer_name: Name of the target layer, used as cache key for the kd-tree
+
+        Returns:
+            Distances in meters, aligned with communes_gdf
+        """
+        tree = self._vertex_trees.get(layer_name)
+        if tree is None:
+            targets = shapely.segmentize(
+                target_gdf.to_crs(self.METRIC_CRS).geometry.values,
+                self.COAST_VERTEX_SPACING_METERS,
+            )
+            tree = cKDTree(shapely.get_coordinates(targets))
+            self._vertex_trees[layer_name] = tree
+
+        communes = np.asarray(communes_gdf.to_crs(self.METRIC_CRS).geometry.values)
+        centroids = shapely.centroid(communes)
+        distances: np.ndarray
+        distances, _ = tree.query(shapely.get_coordinates(centroids), k=1, workers=-1)
+
+        return distances
 
     def compute_sea_distances(
         self,
@@ -36,6 +189,9 @@ class AnalysisService:
         """
         Compute distance to sea for all communes.
 
+        Distance from each commune centroid to the coastline, within
+        COAST_VERTEX_SPACING_METERS / 2.
+
         Args:
             communes_gdf: Communes GeoDataFrame (loaded from registry if None)
 
@@ -43,10 +199,7 @@ class AnalysisService:
             DataFrame with code_insee and distance_mer columns
         """
         if communes_gdf is None:
-            communes_layer = self.registry.get_communes()
-            if communes_layer is None:
-                raise ValueError("No communes layer registered")
-            communes_gdf = communes_layer.load()
+            communes_gdf = self._get_communes_gdf()
 
         coastline = self.registry.get_vector("coastline")
         if coastline is None:
@@ -54,14 +207,9 @@ class AnalysisService:
 
         coastline_gdf = coastline.load()
 
-        distances = VectorProcessor.calculate_distances(
-            communes_gdf, coastline_gdf
-        )
+        distances = self._nearest_vertex_distance(communes_gdf, coastline_gdf, "coastline")
 
-        return pd.DataFrame({
-            "code_insee": communes_gdf["code_insee"],
-            "distance_mer": distances,
-        })
+        return self._distance_frame(communes_gdf, "distance_mer", distances)
 
     def compute_mountain_distances(
         self,
@@ -77,22 +225,14 @@ class AnalysisService:
             DataFrame with code_insee and distance_montagne columns
         """
         if communes_gdf is None:
-            communes_layer = self.registry.get_communes()
-            if communes_layer is None:
-                raise ValueError("No communes layer registered")
-            communes_gdf = communes_layer.load()
+            communes_gdf = self._get_communes_gdf()
 
         # Try vector mountain zones first
         mountains = self.registry.get_vector("mountains")
         if mountains:
             mountains_gdf = mountains.load()
-            distances = VectorProcessor.calculate_distances(
-                communes_gdf, mountains_gdf
-            )
-            return pd.DataFrame({
-                "code_insee": communes_gdf["code_insee"],
-                "distance_montagne": distances,
-            })
+            distances = self._vectorized_distance(communes_gdf, mountains_gdf, "mountains")
+            return self._distance_frame(communes_gdf, "distance_montagne", distances)
 
         # Fall back to elevation raster
         elevation = self.registry.get_raster("elevation")
@@ -127,10 +267,7 @@ class AnalysisService:
             DataFrame with code_insee and sampled values
         """
         if communes_gdf is None:
-            communes_layer = self.registry.get_communes()
-            if communes_layer is None:
-                raise ValueError("No communes layer registered")
-            communes_gdf = communes_layer.load()
+            communes_gdf = self._get_communes_gdf()
 
         raster = self.registry.get_raster(raster_name)
         if raster is None:
@@ -142,6 +279,11 @@ class AnalysisService:
                 communes_gdf,
                 column_name=raster_name,
             )
+        elif method == "zonal" and len(communes_gdf) >= self.ZONAL_RASTERIZE_MIN_FEATURES:
+            result = pd.DataFrame({
+                "code_insee": communes_gdf["code_insee"].to_numpy(),
+                raster_name: self._rasterized_zonal_mean(raster.path, communes_gdf),
+            })
         elif method == "zonal":
             result = RasterProcessor.zonal_statistics(
                 raster.path,
@@ -157,6 +299,81 @@ class AnalysisService:
             raster_name: result[raster_name],
         })
 
+    @staticmethod
+    def _rasterized_zonal_mean(
+        raster_path: str | Path,
+        communes_gdf: gpd.GeoDataFrame,
+    ) -> np.ndarray:
+        """
+        Compute the mean raster value of every commune in one pass.
+
+        All communes are burnt into a single label raster (row position + 1,
+        0 outside) over their extent, then valid pixels are summed and counted
+        per label with np.bincount. A pixel belongs to the commune containing
+        its center; nodata and NaN pixels are ignored.
+
+        Args:
+            raster_path: Path to the raster file (first band is used)
+            communes_gdf: Communes GeoDataFrame
+
+        Returns:
+            Mean values aligned with communes_gdf rows (NaN for communes
+            covering no valid pixel)
+        """
+        import rasterio
+        from rasterio.features import rasterize
+        from rasterio.windows import Window, from_bounds
+
+        n_communes = len(communes_gdf)
+        means = np.full(n_communes, np.nan)
+
+        with rasterio.open(raster_path) as src:
+            geometries = communes_gdf.geometry
+            if src.crs is not None and geometries.crs is not None and geometries.crs != src.crs:
+                geometries = geometries.to_crs(src.crs)
+
+            # Integer window covering the communes, clipped to the raster
+            bounds = from_bounds(*geometries.total_bounds, transform=src.transform)
+            col_start = max(int(np.floor(bounds.col_off)), 0)
+            row_start = max(int(np.floor(bounds.row_off)), 0)
+            col_stop = min(int(np.ceil(bounds.col_off + bounds.width)), src.width)
+            row_stop = min(int(np.ceil(bounds.row_off + bounds.height)), src.height)
+            if col_stop <= col_start or row_stop <= row_start:
+                return means
+
+            window = Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+            values = src.read(1, window=window, masked=True)
+            transform = src.window_transform(window)
+
+        shapes = [
+            (geometry, label)
+            for label, geometry in enumerate(np.asarray(geometries.values), start=1)
+            if geometry is not None and not geometry.is_empty
+        ]
+        if not shapes:
+            return means
+
+        labels = rasterize(
+            shapes,
+            out_shape=values.shape,
+            transform=transform,
+            fill=0,
+            dtype="int32",
+        )
+
+        valid = ~np.ma.getmaskarray(values) & np.isfinite(values.data)
+        pixel_labels = labels[valid]
+        sums = np.bincount(
+            pixel_labels,
+            weights=values.data[valid].astype(np.float64),
+            minlength=n_communes + 1,
+        )
+        counts = np.bincount(pixel_labels, minlength=n_communes + 1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums[1:] / counts[1:]
+        return means
+
     def compute_all_scores(
         self,
         weights: dict[str, float] | None = None,
@@ -164,12 +381,24 @@ class AnalysisService:
         """
         Compute all scores for all communes.
 
+        Results are cached per weight set (LRU, SCORE_CACHE_SIZE entries) and
+        dropped whenever a layer file changes. The returned GeoDataFrame is
+        shared between callers: do not modify it in place.
+
         Args:
             weights: Optional custom weights for global score
 
         Returns:
             GeoDataFrame with all score columns
         """
+        self._refresh_score_caches()
+
+        key = self._weights_key(weights)
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            self._score_cache.move_to_end(key)
+            return cached
+
         result = self.score_processor.compute_all_scores()
 
         # Recompute global score with custom weights if provided
@@ -178,8 +407,98 @@ class AnalysisService:
                 result, weights
             )
 
+        self._add_centroids(result)
+        self._set_score_columns(result)
+
+        self._score_cache[key] = result
+        if len(self._score_cache) > self.SCORE_CACHE_SIZE:
+            evicted, _ = self._score_cache.popitem(last=False)
+            self._code_indexes.pop(evicted, None)
+
         return result
 
+    @staticmethod
+    def _add_centroids(gdf: gpd.GeoDataFrame) -> None:
+        """Add centroid coordinates as `_cx` / `_cy` columns, computed in one pass."""
+        centroids = shapely.centroid(np.asarray(gdf.geometry.values))
+        gdf["_cx"] = shapely.get_x(centroids)
+        gdf["_cy"] = shapely.get_y(centroids)
+
+    @staticmethod
+    def _set_score_columns(gdf: gpd.GeoDataFrame) -> None:
+        """Record the score columns of a scores GeoDataFrame in its attrs."""
+        gdf.attrs["_score_cols"] = [col for col in gdf.columns if col.startswith("score_")]
+
+    @staticmethod
+    def _score_columns(gdf: gpd.GeoDataFrame) -> list[str]:
+        """Get the score columns of a GeoDataFrame (recorded in attrs, else scanned)."""
+        score_cols: list[str] | None = gdf.attrs.get("_score_cols")
+        if score_cols is None:
+            score_cols = [col for col in gdf.columns if col.startswith("score_")]
+        return score_cols
+
+    @staticmethod
+    def _weights_key(weights: dict[str, float] | None) -> bytes:
+        """Hash a weight set (key order does not matter)."""
+        return hashlib.blake2b(
+            orjson.dumps(weights or {}, option=orjson.OPT_SORT_KEYS),
+            digest_size=16,
+        ).digest()
+
+    def _refresh_score_caches(self) -> None:
+        """Drop cached scores and communes if a layer file changed since they were loaded."""
+        fingerprint = self._layers_fingerprint()
+        if fingerprint != self._score_cache_fingerprint:
+            self._score_cache.clear()
+            self._code_indexes.clear()
+            self._communes = None
+            self._score_cache_fingerprint = fingerprint
+
+    def _get_code_index(self, scores_gdf: gpd.GeoDataFrame) -> pd.Index:
+        """
+        Get a code INSEE index over the rows of a scores GeoDataFrame.
+
+        Memoized for results cached by compute_all_scores, so the hash table
+        is built once per result instead of comparing every row per lookup.
+        """
+        for key, cached in self._score_cache.items():
+            if cached is scores_gdf:
+                index = self._code_indexes.get(key)
+                if index is None:
+                    index = pd.Index(scores_gdf["code_insee"])
+                    self._code_indexes[key] = index
+                return index
+
+        return pd.Index(scores_gdf["code_insee"])
+
+    def _layers_fingerprint(self) -> str:
+        """
+        Get a fingerprint of the registered layer files (names, mtimes, sizes).
+
+        Changes whenever a layer is registered, removed or its file modified.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        layers = self.registry.list_layers()
+        getters = {
+            "vector": self.registry.get_vector,
+            "raster": self.registry.get_raster,
+            "table": self.registry.get_table,
+        }
+
+        for kind, getter in getters.items():
+            for name in sorted(layers.get(kind, [])):
+                layer = getter(name)
+                state = "missing"
+                if layer is not None:
+                    try:
+                        stat = Path(layer.path).stat()
+                        state = f"{stat.st_mtime_ns}:{stat.st_size}"
+                    except OSError:
+                        pass
+                digest.update(f"{kind}:{name}:{state};".encode())
+
+        return digest.hexdigest()
+
     def export_scores_to_geojson(
         self,
         gdf: gpd.GeoDataFrame,
@@ -197,20 +516,78 @@ class AnalysisService:
         Returns:
             GeoJSON dictionary
         """
-        from app.data.loaders import ShapefileLoader
+        return orjson.loads(self.export_scores_to_geojson_bytes(gdf, simplify, properties))
 
+    def export_scores_to_geojson_bytes(
+        self,
+        gdf: gpd.GeoDataFrame,
+        simplify: float | None = 0.001,
+        properties: list[str] | None = None,
+    ) -> bytes:
+        """
+        Export scores GeoDataFrame to serialized GeoJSON.
+
+        Geometries are simplified and written by GEOS in bulk
+        (shapely.simplify / shapely.to_geojson), properties are extracted in
+        one pandas pass, and the collection is encoded by orjson with the
+        geometry JSON embedded as is.
+
+        Args:
+            gdf: GeoDataFrame with scores
+            simplify: Geometry simplification tolerance (None to disable)
+            properties: Properties to include (None for all)
+
+        Returns:
+            GeoJSON FeatureCollection as UTF-8 bytes
+        """
         # Default properties if not specified
         if properties is None:
             properties = [
                 "code_insee", "nom", "population",
                 "score_global",
-            ] + [col for col in gdf.columns if col.startswith("score_")]
+                *self._score_columns(gdf),
+            ]
 
-        return ShapefileLoader.to_geojson(
-            gdf,
-            properties=properties,
-            simplify_tolerance=simplify,
-        )
+        # Existing columns only, without duplicates (score_global is listed twice)
+        properties = [col for col in dict.fromkeys(properties) if col in gdf.columns]
+
+        geometries = np.asarray(gdf.geometry.values)
+        if simplify:
+            geometries = self._simplify_parallel(geometries, simplify)
+
+        records = gdf[properties].to_dict(orient="records")
+        features = [
+            {
+                "type": "Feature",
+                "properties": record,
+                "geometry": orjson.Fragment(geometry) if geometry is not None else None,
+            }
+            for record, geometry in zip(records, shapely.to_geojson(geometries), strict=True)
+        ]
+
+        return orjson_dumps({"type": "FeatureCollection", "features": features})
+
+    def _simplify_parallel(self, geometries: np.ndarray, tolerance: float) -> np.ndarray:
+        """
+        Simplify geometries (topology-preserving) in parallel chunks.
+
+        shapely.simplify releases the GIL, so chunks of SIMPLIFY_CHUNK_SIZE
+        geometries are simplified concurrently on a thread pool.
+        """
+        if len(geometries) <= self.SIMPLIFY_CHUNK_SIZE:
+            result: np.ndarray = shapely.simplify(geometries, tolerance, preserve_topology=True)
+            return result
+
+        chunks = [
+            geometries[start:start + self.SIMPLIFY_CHUNK_SIZE]
+            for start in range(0, len(geometries), self.SIMPLIFY_CHUNK_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=min(len(chunks), os.cpu_count() or 1)) as executor:
+            simplified = executor.map(
+                lambda chunk: shapely.simplify(chunk, tolerance, preserve_topology=True),
+                chunks,
+            )
+            return np.concatenate(list(simplified))
 
     def get_commune_detail(
         self,
@@ -230,21 +607,26 @@ class AnalysisService:
         if scores_gdf is None:
             scores_gdf = self.compute_all_scores()
 
-        commune = scores_gdf[scores_gdf["code_insee"] == code_insee]
-        if len(commune) == 0:
+        position = self._get_code_index(scores_gdf).get_indexer_for([code_insee])[0]
+        if position == -1:
             return None
 
-        row = commune.iloc[0]
+        row = scores_gdf.iloc[position]
 
-        # Extract score columns
-        scores = {}
-        for col in commune.columns:
-            if col.startswith("score_") and col != "score_global":
-                category = col.replace("score_", "")
-                scores[category] = float(row[col])
+        # Extract score columns in one cast
+        score_cols = [col for col in self._score_columns(scores_gdf) if col != "score_global"]
+        scores = dict(zip(
+            (col.removeprefix("score_") for col in score_cols),
+            row[score_cols].to_numpy(dtype=np.float64).tolist(),
+            strict=True,
+        ))
 
-        # Get centroid coordinates
-        centroid = row.geometry.centroid
+        # Get centroid coordinates (precomputed for cached results)
+        if "_cx" in row.index:
+            lat, lng = float(row["_cy"]), float(row["_cx"])
+        else:
+            centroid = row.geometry.centroid
+            lat, lng = centroid.y, centroid.x
 
         return {
             "code_insee": row["code_insee"],
@@ -255,8 +637,8 @@ class AnalysisService:
             "region_code": row.get("region_code", ""),
             "population": int(row.get("population", 0)),
             "coordinates": {
-                "lat": centroid.y,
-                "lng": centroid.x,
+                "lat": lat,
+                "lng": lng,
             },
             "scores": scores,
             "score_global": float(row["score_global"]),
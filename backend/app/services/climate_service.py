@@ -4,16 +4,28 @@ Climate data integration service.
 Provides high-level API for loading and processing Météo France climate data.
 """
 
+import hashlib
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import geopandas as gpd
 import numpy as np
+import orjson
 import pandas as pd
+import shapely
 
 from app.data.loaders.point_grid import PointGridLoader
-from app.data.processors.raster import RasterProcessor
-from app.data.processors.vector import VectorProcessor
+from app.services.data_registry import get_data_registry
+
+
+class ClimateIndicator(NamedTuple):
+    """Score mapping of a climate indicator."""
+
+    name: str
+    weight: float
+    invert: bool
+    max_value: float
 
 
 class ClimateService:
@@ -26,60 +38,108 @@ class ClimateService:
     - Computing composite climate scores
     """
 
-    # Climate indicators and their score mappings
-    CLIMATE_INDICATORS = {
+    # Climate indicators and their score mappings, in column order
+    CLIMATE_INDICATORS: tuple[tuple[str, ClimateIndicator], ...] = (
         # Extreme heat indicators (lower = better)
-        "NORTX35D_yr": {
-            "name": "Jours >= 35°C",
-            "weight": 1.5,  # High weight for extreme heat
-            "invert": True,
-            "max_value": 30,  # Max expected days
-        },
-        "NORTX30D_yr": {
-            "name": "Jours >= 30°C",
-            "weight": 1.0,
-            "invert": True,
-            "max_value": 90,
-        },
-        "NORTR_yr": {
-            "name": "Nuits tropicales",
-            "weight": 1.0,
-            "invert": True,
-            "max_value": 100,
-        },
+        (
+            "NORTX35D_yr",
+            ClimateIndicator(
+                name="Jours >= 35°C",
+                weight=1.5,  # High weight for extreme heat
+                invert=True,
+                max_value=30,  # Max expected days
+            ),
+        ),
+        (
+            "NORTX30D_yr",
+            ClimateIndicator(
+                name="Jours >= 30°C",
+                weight=1.0,
+                invert=True,
+                max_value=90,
+            ),
+        ),
+        (
+            "NORTR_yr",
+            ClimateIndicator(
+                name="Nuits tropicales",
+                weight=1.0,
+                invert=True,
+                max_value=100,
+            ),
+        ),
         # Fire risk (lower = better)
-        "NORIFM40_yr": {
-            "name": "Jours risque incendie élevé",
-            "weight": 1.5,
-            "invert": True,
-            "max_value": 60,
-        },
+        (
+            "NORIFM40_yr",
+            ClimateIndicator(
+                name="Jours risque incendie élevé",
+                weight=1.5,
+                invert=True,
+                max_value=60,
+            ),
+        ),
         # Extreme precipitation (lower = better)
-        "NORRx1d_yr": {
-            "name": "Intensité précipitations max",
-            "weight": 0.5,
-            "invert": True,
-            "max_value": 100,
-        },
-        "NORRRq99refD_yr": {
-            "name": "Fréquence précipitations extrêmes",
-            "weight": 0.5,
-            "invert": True,
-            "max_value": 10,
-        },
+        (
+            "NORRx1d_yr",
+            ClimateIndicator(
+                name="Intensité précipitations max",
+                weight=0.5,
+                invert=True,
+                max_value=100,
+            ),
+        ),
+        (
+            "NORRRq99refD_yr",
+            ClimateIndicator(
+                name="Fréquence précipitations extrêmes",
+                weight=0.5,
+                invert=True,
+                max_value=10,
+            ),
+        ),
         # Temperature change anomalies (lower = better for stability)
-        "ATMm_yr": {
-            "name": "Écart température moyenne",
-            "weight": 0.5,
-            "invert": True,
-            "max_value": 4,
-        },
-    }
+        (
+            "ATMm_yr",
+            ClimateIndicator(
+                name="Écart température moyenne",
+                weight=0.5,
+                invert=True,
+                max_value=4,
+            ),
+        ),
+    )
+
+    # Maximum number of normalized weight vectors kept in memory
+    NORMALIZED_WEIGHTS_CACHE_SIZE = 16
 
     def __init__(self) -> None:
         """Initialize the climate service."""
         self._climate_data: gpd.GeoDataFrame | None = None
-        self._indicators = self.CLIMATE_INDICATORS.copy()
+        self._indicators = dict(self.CLIMATE_INDICATORS)
+        self._climate_score_cols = tuple(f"score_{indicator}" for indicator in self._indicators)
+
+        # Pipeline results are persisted as GeoParquet by the registry, keyed
+        # by input hashes
+        self.registry = get_data_registry()
+
+        # Score scaling parameters as vectors, in indicator order
+        self._indicator_idx = {indicator: k for k, indicator in enumerate(self._indicators)}
+        self._max_vec = np.array(
+            [indicator.max_value for indicator in self._indicators.values()],
+            dtype=np.float32,
+        )
+        self._invert_vec = np.array(
+            [indicator.invert for indicator in self._indicators.values()],
+            dtype=bool,
+        )
+        self._weight_vec = np.array(
+            [indicator.weight for indicator in self._indicators.values()],
+            dtype=np.float32,
+        )
+        # Normalized weight vectors by (indicators, custom weights)
+        self._normalized_weights_cache: dict[
+            tuple[tuple[str, ...], tuple[tuple[str, float], ...]], np.ndarray
+        ] = {}
 
     def load_climate_projections(
         self,
@@ -88,13 +148,22 @@ class ClimateService:
         """
         Load Météo France climate projections grid.
 
+        Indicator columns are downcast to float32.
+
         Args:
             path: Path to climate data file
 
         Returns:
             GeoDataFrame with climate indicators at each grid point
         """
-        self._climate_data = PointGridLoader.load_meteo_france(path)
+        climate_gdf = PointGridLoader.load_meteo_france(path)
+
+        # Indicators are small physical quantities: float32 is precise enough
+        # and halves the memory of the grid and of everything derived from it
+        indicators = [col for col in self._indicators if col in climate_gdf.columns]
+        climate_gdf[indicators] = climate_gdf[indicators].astype(np.float32)
+
+        self._climate_data = climate_gdf
         return self._climate_data
 
     def get_climate_data(self) -> gpd.GeoDataFrame | None:
@@ -139,15 +208,23 @@ class ClimateService:
         if missing:
             raise ValueError(f"Indicators not found in climate data: {missing}")
 
-        # Aggregate points to communes
-        result = VectorProcessor.aggregate_points_to_polygons(
-            climate_gdf,
-            communes_gdf,
-            value_columns=indicators,
-            agg_func=aggregation,
+        # Aggregate points to communes: one spatial join (STRtree) matching
+        # each point to its commune, then a vectorized groupby per commune
+        points = climate_gdf[[*indicators, "geometry"]]
+        if points.crs != communes_gdf.crs:
+            points = points.to_crs(communes_gdf.crs)
+
+        joined = gpd.sjoin(
+            points,
+            # Unnamed index, so the matched commune index is "index_right"
+            communes_gdf[["geometry"]].rename_axis(None),
+            how="inner",
+            predicate="within",
         )
+        aggregated = joined.groupby("index_right")[indicators].agg(aggregation)
 
-        return result
+        # Communes without any grid point get NaN
+        return communes_gdf.join(aggregated)
 
     def compute_indicator_scores(
         self,
@@ -162,36 +239,37 @@ class ClimateService:
             indicators: Indicators to score (all available if None)
 
         Returns:
-            GeoDataFrame with score columns added
+            GeoDataFrame with score columns added (the input is left unchanged)
         """
-        result = communes_with_climate.copy()
-
         if indicators is None:
             indicators = [
                 ind for ind in self._indicators.keys()
                 if ind in communes_with_climate.columns
             ]
 
-        for indicator in indicators:
-            if indicator not in result.columns:
-                continue
-
-            config = self._indicators.get(indicator, {})
-
-            # Get values
-            values = result[indicator].values
-
-            # Convert to score
-            scores = RasterProcessor.value_to_score(
-                values,
-                min_value=0,
-                max_value=config.get("max_value"),
-                invert=config.get("invert", False),
-            )
-
-            result[f"score_{indicator}"] = scores
-
-        return result
+        indicators = [
+            ind
+            for ind in indicators
+            if ind in communes_with_climate.columns and ind in self._indicator_idx
+        ]
+        if not indicators:
+            return communes_with_climate.copy(deep=False)
+
+        # All indicators scaled at once: (value / max) clipped to [0, 1] * 100,
+        # inverted where lower values are better
+        positions = [self._indicator_idx[ind] for ind in indicators]
+        values = communes_with_climate[indicators].to_numpy(dtype=np.float32)
+        scores = np.clip(values / self._max_vec[positions], 0, 1) * 100.0
+        scores = np.where(self._invert_vec[positions], 100.0 - scores, scores)
+
+        # Joined as a columns-only frame: existing columns (geometries
+        # included) are not copied
+        scores_df = pd.DataFrame(
+            scores,
+            index=communes_with_climate.index,
+            columns=[f"score_{ind}" for ind in indicators],
+        )
+        return communes_with_climate.join(scores_df)
 
     def compute_climate_score(
         self,
@@ -208,11 +286,9 @@ class ClimateService:
         Returns:
             Series with composite climate scores (0-100)
         """
-        # Find all score columns
-        score_cols = [
-            col for col in communes_with_scores.columns
-            if col.startswith("score_") and col.replace("score_", "") in self._indicators
-        ]
+        # Find all indicator score columns, in indicator order
+        columns = communes_with_scores.columns
+        score_cols = [col for col in self._climate_score_cols if col in columns]
 
         if not score_cols:
             return pd.Series(
@@ -220,32 +296,65 @@ class ClimateService:
                 index=communes_with_scores.index
             )
 
-        # Get weights
-        weights = []
-        for col in score_cols:
-            indicator = col.replace("score_", "")
-            if custom_weights and indicator in custom_weights:
-                weights.append(custom_weights[indicator])
-            else:
-                weights.append(self._indicators.get(indicator, {}).get("weight", 1.0))
-
-        # Normalize weights
-        total_weight = sum(weights)
-        if total_weight == 0:
-            normalized_weights = [1.0 / len(weights)] * len(weights)
-        else:
-            normalized_weights = [w / total_weight for w in weights]
-
-        # Compute weighted average
-        score_values = communes_with_scores[score_cols].values
+        normalized_weights = self._normalized_weights(
+            tuple(col.removeprefix("score_") for col in score_cols),
+            tuple(sorted((custom_weights or {}).items())),
+        )
 
-        # Handle NaN values
-        score_values = np.nan_to_num(score_values, nan=50.0)
+        # Compute weighted average in one pass over a float32 copy of the scores:
+        # NaN replaced in place, then a single matrix-vector product
+        score_values = communes_with_scores[score_cols].to_numpy(dtype=np.float32, copy=True)
+        np.nan_to_num(score_values, copy=False, nan=50.0)
 
-        composite_score = np.average(score_values, axis=1, weights=normalized_weights)
+        composite_score = score_values @ normalized_weights
 
         return pd.Series(composite_score, index=communes_with_scores.index)
 
+    def _normalized_weights(
+        self,
+        indicators: tuple[str, ...],
+        weights_key: tuple[tuple[str, float], ...],
+    ) -> np.ndarray:
+        """
+        Build the normalized weight vector of the given indicators.
+
+        Default weights are overridden by custom weights, then normalized to
+        sum to 1 (uniform if they sum to 0). The NORMALIZED_WEIGHTS_CACHE_SIZE
+        latest vectors are cached; the returned array is read-only.
+
+        Args:
+            indicators: Indicators, in score column order
+            weights_key: Sorted (indicator, weight) custom weight items
+
+        Returns:
+            float32 weights aligned with indicators
+        """
+        cache_key = (indicators, weights_key)
+        cached = self._normalized_weights_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        weights = self._weight_vec[[self._indicator_idx[ind] for ind in indicators]]
+        custom_weights = dict(weights_key)
+        for j, indicator in enumerate(indicators):
+            if indicator in custom_weights:
+                weights[j] = custom_weights[indicator]
+
+        total_weight = weights.sum()
+        if total_weight == 0:
+            normalized = np.full(len(weights), 1.0 / len(weights), dtype=np.float32)
+        else:
+            normalized = (weights / total_weight).astype(np.float32)
+
+        normalized.flags.writeable = False
+
+        cache = self._normalized_weights_cache
+        if len(cache) >= self.NORMALIZED_WEIGHTS_CACHE_SIZE:
+            # Dicts keep insertion order: the first key is the oldest
+            cache.pop(next(iter(cache)))
+        cache[cache_key] = normalized
+        return normalized
+
     def process_full_pipeline(
         self,
         climate_path: str | Path,
@@ -259,6 +368,12 @@ class ClimateService:
         3. Compute indicator scores
         4. Compute composite climate score
 
+        The aggregated table (steps 1-2) and the final scores are cached as
+        GeoParquet in data/cache/, keyed by the contents of the climate file and
+        the communes (plus the indicator configuration for the scores): later
+        runs on the same inputs skip the spatial join, or the whole pipeline.
+        The climate grid is not loaded on a cache hit.
+
         Args:
             climate_path: Path to Météo France data file
             communes_gdf: Communes GeoDataFrame
@@ -266,18 +381,64 @@ class ClimateService:
         Returns:
             Communes with climate scores
         """
-        # 1. Load climate data
-        climate_gdf = self.load_climate_projections(climate_path)
+        inputs_key = self._inputs_hash(climate_path, communes_gdf)
+        config_key = hashlib.blake2b(
+            orjson.dumps(self.get_indicator_info(), option=orjson.OPT_SORT_KEYS),
+            digest_size=8,
+        ).hexdigest()
+
+        def aggregate() -> gpd.GeoDataFrame:
+            # 1. Load climate data
+            climate_gdf = self.load_climate_projections(climate_path)
 
-        # 2. Aggregate to communes
-        result = self.aggregate_to_communes(communes_gdf, climate_gdf)
+            # 2. Aggregate to communes
+            return self.aggregate_to_communes(communes_gdf, climate_gdf)
 
-        # 3. Compute individual scores
-        result = self.compute_indicator_scores(result)
+        def score() -> gpd.GeoDataFrame:
+            aggregated = self._cached_frame(f"climate_agg_{inputs_key}", aggregate)
 
-        # 4. Compute composite score
-        result["score_climat"] = self.compute_climate_score(result)
+            # 3. Compute individual scores
+            result = self.compute_indicator_scores(aggregated)
+
+            # 4. Compute composite score
+            result["score_climat"] = self.compute_climate_score(result)
+
+            return result
+
+        return self._cached_frame(f"climate_scores_{inputs_key}_{config_key}", score)
+
+    @staticmethod
+    def _inputs_hash(climate_path: str | Path, communes_gdf: gpd.GeoDataFrame) -> str:
+        """Hash the contents of the climate file and the commune geometries."""
+        digest = hashlib.blake2b(digest_size=8)
+
+        with Path(climate_path).open("rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+
+        digest.update(pd.util.hash_pandas_object(communes_gdf.drop(columns="geometry")).to_numpy())
+        for wkb in shapely.to_wkb(np.asarray(communes_gdf.geometry.values)):
+            digest.update(wkb)
+
+        return digest.hexdigest()
+
+    def _cached_frame(
+        self,
+        name: str,
+        compute: Callable[[], gpd.GeoDataFrame],
+    ) -> gpd.GeoDataFrame:
+        """
+        Read a pipeline result from the GeoParquet cache, or compute and store it.
+
+        Uses the registry cache (atomic writes; an unreadable file is recomputed).
+        Caching is skipped if pyarrow is not installed.
+        """
+        cached = self.registry.load_cached_gdf(name)
+        if cached is not None:
+            return cached
 
+        result = compute()
+        self.registry.save_cached_gdf(name, result)
         return result
 
     def get_indicator_info(self) -> dict[str, dict[str, Any]]:
@@ -287,4 +448,4 @@ class ClimateService:
         Returns:
             Dictionary with indicator metadata
         """
-        return self._indicators.copy()
+        return {column: indicator._asdict() for column, indicator in self._indicators.items()}
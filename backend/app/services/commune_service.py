@@ -5,136 +5,466 @@ Uses DataRegistry to load commune data from shapefiles and compute
 scores based on available datasets in the manifest.
 """
 
+import base64
+import binascii
 import time
 from typing import Any
 
+import numpy as np
+import orjson
+
 from app.models.commune import (
     CommuneDetail,
-    CommuneSummary,
+    CommuneSummaryRecord,
+    Coordinates,
+    CoordinatesRecord,
 )
 from app.models.requests import SearchRequest
-from app.models.responses import PaginatedResponse, SearchResponse
 from app.services.data_registry import get_data_registry
+from app.services.scoring_service import get_scoring_service
+
+
+def encode_cursor(sort_value: Any, code_insee: str) -> str:
+    """
+    Encode a keyset pagination cursor.
+
+    The cursor holds the sort value and code INSEE of the last returned row,
+    so the next page starts right after it regardless of its offset.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps([sort_value, code_insee])).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[Any, str]:
+    """
+    Decode a keyset pagination cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort_value, code_insee = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Curseur de pagination invalide : {cursor}") from e
+
+    if not isinstance(code_insee, str):
+        raise ValueError(f"Curseur de pagination invalide : {cursor}")
+
+    return sort_value, code_insee
 
 
 class CommuneService:
     """Service for commune-related operations."""
 
+    # Fields accepted by list_communes(sort_by=...)
+    SORTABLE_FIELDS = ("score_global", "population", "nom", "code_insee")
+
     def __init__(self) -> None:
         """Initialize service with data registry."""
         self.registry = get_data_registry()
+        self.scoring_service = get_scoring_service()
+
+        # In-memory commune table (one array per column, same row order),
+        # built on first use by _load_communes()
+        self._loaded = False
+        # Registry generation the table was built from (rebuilt after a reset)
+        self._registry_generation = -1
+        self._codes: np.ndarray = np.empty(0, dtype=object)
+        self._noms: np.ndarray = np.empty(0, dtype=object)
+        self._dept_codes: np.ndarray = np.empty(0, dtype=object)
+        self._region_codes: np.ndarray = np.empty(0, dtype=object)
+        self._populations: np.ndarray = np.empty(0, dtype=np.int64)
+        self._lats: np.ndarray = np.empty(0, dtype=np.float64)
+        self._lngs: np.ndarray = np.empty(0, dtype=np.float64)
+
+        # Per-filter scores, shape (communes, filters), and the matching filter IDs
+        self._filter_ids: list[str] = []
+        self._score_matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        # Global score with the default weights
+        self._score_global: np.ndarray = np.empty(0, dtype=np.float32)
+
+        # Indexes: code INSEE -> row, departement/region code -> rows
+        self._by_insee: dict[str, int] = {}
+        self._by_dept: dict[str, np.ndarray] = {}
+        self._by_region: dict[str, np.ndarray] = {}
+
+        # Per sortable field: rows in ascending (value, code INSEE) order, and
+        # the position of each row in that order
+        self._sorted_idx: dict[str, np.ndarray] = {}
+        self._sort_rank: dict[str, np.ndarray] = {}
+
+    def warm_up(self) -> bool:
+        """
+        Load the commune table and score the default weights ahead of requests.
+
+        Returns:
+            False if communes data is not available
+        """
+        return self._load_communes()
+
+    def _load_communes(self) -> bool:
+        """
+        Build the in-memory commune table and its indexes.
+
+        Done once, from the communes GeoDataFrame of the registry, and again
+        after the registry was reset.
+
+        Returns:
+            False if communes data is not available
+        """
+        if self._loaded and self._registry_generation == self.registry.generation:
+            return True
+
+        gdf = self.registry.load_communes_gdf()
+        # Per-filter scores, shared with the registry (columns in filter order),
+        # and the global scores with the default weights (shared with the map)
+        score_matrix = self.registry.get_score_matrix()
+        score_global = self.scoring_service.get_default_global_scores()
+        if gdf is None or score_matrix is None or score_global is None:
+            return False
+
+        config = self.registry.get_communes_config()
+
+        def column(name: str, default: Any) -> Any:
+            if name not in gdf.columns:
+                return np.full(len(gdf), default, dtype=object)
+            return gdf[name].fillna(default).to_numpy()
+
+        # Centroids computed in Lambert-93 (metric), returned in WGS84
+        centroids = gdf.geometry.to_crs("EPSG:2154").centroid.to_crs("EPSG:4326")
+
+        self._codes = column(config.id_column, "").astype(str).astype(object)
+        self._noms = column(config.name_column, "").astype(str).astype(object)
+        self._dept_codes = column(config.department_column, "").astype(str).astype(object)
+        self._region_codes = column(config.region_column, "").astype(str).astype(object)
+        self._populations = column(config.population_column, 0).astype(np.int64)
+        self._lats = centroids.y.to_numpy(dtype=np.float64)
+        self._lngs = centroids.x.to_numpy(dtype=np.float64)
+
+        self._filter_ids = self._get_available_filters()
+        self._score_matrix = score_matrix
+        self._score_global = score_global
+
+        self._by_insee = {code: row for row, code in enumerate(self._codes)}
+        self._by_dept = self._group_rows(self._dept_codes)
+        self._by_region = self._group_rows(self._region_codes)
+
+        # Pre-sorted rows, so pages are slices instead of a sort per request
+        codes = self._codes.astype(str)
+        for field in self.SORTABLE_FIELDS:
+            values = self._sort_values(field)
+            if values.dtype == object:
+                values = values.astype(str)
+            sorted_idx = np.lexsort((codes, values))
+            rank = np.empty_like(sorted_idx)
+            rank[sorted_idx] = np.arange(len(sorted_idx))
+            self._sorted_idx[field] = sorted_idx
+            self._sort_rank[field] = rank
+
+        self._registry_generation = self.registry.generation
+        self._loaded = True
+        return True
+
+    def _sort_values(self, field: str) -> np.ndarray:
+        """Get the column used to sort communes by a field."""
+        return {
+            "score_global": self._score_global,
+            "population": self._populations,
+            "nom": self._noms,
+            "code_insee": self._codes,
+        }[field]
+
+    @staticmethod
+    def _group_rows(keys: np.ndarray) -> dict[str, np.ndarray]:
+        """Group row positions by key (e.g. departement code)."""
+        groups: dict[str, list[int]] = {}
+        for row, key in enumerate(keys):
+            groups.setdefault(key, []).append(row)
+        return {key: np.asarray(rows, dtype=np.intp) for key, rows in groups.items()}
 
     def _get_available_filters(self) -> list[str]:
         """Get list of available filter IDs."""
         return [f.id for f in self.registry.get_available_filters()]
 
-    def _calculate_global_score(
+    def _calculate_global_scores(
         self,
-        scores: dict[str, float],
+        score_matrix: np.ndarray,
         weights: dict[str, float],
-    ) -> float:
+    ) -> np.ndarray:
         """
-        Calculate weighted global score.
+        Calculate weighted global scores for many communes at once.
 
         Args:
-            scores: Dict of filter_id -> score (0-100)
+            score_matrix: Scores (0-100), shape (communes, filters)
             weights: Dict of filter_id -> weight (0-100)
 
         Returns:
-            Weighted average score (0-100)
+            Weighted average scores (0-100), shape (communes,)
         """
-        total_weight = 0.0
-        weighted_sum = 0.0
-
-        for filter_id, weight in weights.items():
-            if filter_id in scores and weight > 0:
-                weighted_sum += scores[filter_id] * weight
-                total_weight += weight
-
-        if total_weight == 0:
-            return 50.0  # Default neutral score
-
-        return weighted_sum / total_weight
+        return self.scoring_service.calculate_global_scores_batch(score_matrix, weights)
 
     def _get_default_weights(self) -> dict[str, float]:
         """Get default weights for all available filters."""
-        filters = self.registry.get_available_filters()
-        return {f.id: float(f.weight_default) for f in filters}
+        return self.scoring_service.get_default_weights()
 
-    async def list_communes(
+    def list_communes(
         self,
         limit: int = 50,
         offset: int = 0,
         sort_by: str = "score_global",
         order: str = "desc",
-    ) -> PaginatedResponse[CommuneSummary]:
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
         """
         List communes with pagination.
 
+        Returns a PaginatedResponse[CommuneSummary]-shaped dict of lightweight
+        records, serialized by orjson without Pydantic in the way.
+
+        When a cursor is given (keyset pagination on `(sort_by, code_insee)`),
+        the page starts right after the cursor row and `offset` is ignored.
         Returns empty list if communes data is not yet available.
+
+        Raises:
+            ValueError: If sort_by is not sortable or the cursor is malformed
         """
-        # Check if communes data is available
-        if not self.registry.has_communes_data():
-            return PaginatedResponse(
-                data=[],
-                total=0,
-                limit=limit,
-                offset=offset,
-                has_more=False,
+        if sort_by not in self.SORTABLE_FIELDS:
+            raise ValueError(f"Champ de tri invalide : {sort_by}")
+
+        cursor_position = decode_cursor(cursor) if cursor is not None else None
+
+        if not self._load_communes():
+            return self._page_payload([], total=0, limit=limit, offset=offset)
+
+        # Pre-sorted rows: a page is a slice, O(limit) instead of a sort per request
+        sorted_idx = self._sorted_idx[sort_by]
+        descending = order == "desc"
+        if descending:
+            sorted_idx = sorted_idx[::-1]
+        total = len(sorted_idx)
+
+        if cursor_position is not None:
+            offset = self._cursor_start(sort_by, descending, *cursor_position)
+
+        page = sorted_idx[offset : offset + limit]
+        departement_names = self._departement_names()
+        data = [
+            self._summary_record(int(row), float(self._score_global[row]), departement_names)
+            for row in page
+        ]
+
+        next_cursor = None
+        if offset + len(page) < total and len(page) > 0:
+            last = int(page[-1])
+            sort_value = self._sort_values(sort_by)[last]
+            next_cursor = encode_cursor(
+                sort_value.item() if isinstance(sort_value, np.generic) else sort_value,
+                self._codes[last],
             )
 
-        # TODO: Load communes from shapefile and compute scores
-        # For now, return empty until communes shapefile is added
-        return PaginatedResponse(
-            data=[],
-            total=0,
-            limit=limit,
-            offset=offset,
-            has_more=False,
-        )
+        return self._page_payload(data, total, limit, offset, next_cursor)
+
+    def _cursor_start(
+        self,
+        sort_by: str,
+        descending: bool,
+        sort_value: Any,
+        code_insee: str,
+    ) -> int:
+        """
+        Get the position right after a cursor row in the sorted order.
+
+        O(1) through the rank of the cursor row; falls back to a binary search
+        on the sort value if the row no longer exists.
+        """
+        total = len(self._codes)
+        row = self._by_insee.get(code_insee)
+
+        if row is not None:
+            position = int(self._sort_rank[sort_by][row])
+            return total - position if descending else position + 1
+
+        sorted_values = self._sort_values(sort_by)[self._sorted_idx[sort_by]]
+        try:
+            if descending:
+                return total - int(np.searchsorted(sorted_values, sort_value, side="left"))
+            return int(np.searchsorted(sorted_values, sort_value, side="right"))
+        except TypeError as e:
+            raise ValueError(f"Curseur de pagination invalide : {sort_value}") from e
+
+    @staticmethod
+    def _page_payload(
+        data: list[CommuneSummaryRecord],
+        total: int,
+        limit: int,
+        offset: int,
+        next_cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """Build a PaginatedResponse-shaped payload, ready for orjson."""
+        return {
+            "data": data,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + len(data) < total,
+            "next_cursor": next_cursor,
+        }
 
-    async def get_commune(self, code_insee: str) -> CommuneDetail | None:
+    def get_commune(self, code_insee: str) -> CommuneDetail | None:
         """
         Get detailed commune information.
 
-        Returns None if communes data is not yet available.
+        O(1) lookup through the code INSEE index. The model is built with
+        model_construct (no validation): values come from our own arrays and
+        the response is validated against CommuneDetail by FastAPI anyway.
+        Returns None if the commune is unknown or communes data is not yet available.
         """
-        if not self.registry.has_communes_data():
+        if not self._load_communes():
             return None
 
-        # TODO: Load from shapefile and compute scores
-        return None
+        row = self._by_insee.get(code_insee)
+        if row is None:
+            return None
+
+        dept_code = self._dept_codes[row]
+        region_code = self._region_codes[row]
+
+        scores = self._score_matrix[row]
+
+        return CommuneDetail.model_construct(
+            code_insee=code_insee,
+            nom=str(self._noms[row]),
+            departement=self._departement_names().get(dept_code, dept_code),
+            departement_code=dept_code,
+            region=self._region_names().get(region_code, region_code),
+            region_code=region_code,
+            population=int(self._populations[row]),
+            coordinates=Coordinates.model_construct(
+                lat=float(self._lats[row]),
+                lng=float(self._lngs[row]),
+            ),
+            scores={
+                filter_id: round(float(scores[k]), 1)
+                for k, filter_id in enumerate(self._filter_ids)
+            },
+            score_global=round(float(self._score_global[row]), 1),
+        )
 
-    async def search_communes(self, request: SearchRequest) -> SearchResponse:
+    def _departement_names(self) -> dict[str, str]:
+        """Get departement code -> name from reference data."""
+        return {d["code"]: d["nom"] for d in self.registry.get_departements()}
+
+    def _region_names(self) -> dict[str, str]:
+        """Get region code -> name from reference data."""
+        return {r["code"]: r["nom"] for r in self.registry.get_regions()}
+
+    def search_communes(self, request: SearchRequest) -> dict[str, Any]:
         """
         Search communes with custom weights and filters.
 
+        Filters and scores are computed on whole columns of the commune table
+        (NumPy masks and a matrix-vector product), not commune by commune.
+        Returns a SearchResponse-shaped dict of lightweight records, best scores first.
         Returns empty results if communes data is not yet available.
         """
         start_time = time.perf_counter()
 
-        if not self.registry.has_communes_data():
-            return SearchResponse(
-                communes=[],
-                total=0,
-                execution_time_ms=round((time.perf_counter() - start_time) * 1000, 2),
+        if not self._load_communes():
+            return {
+                "communes": [],
+                "total": 0,
+                "execution_time_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            }
+
+        # Candidate rows, narrowed with the departement index then boolean masks
+        if request.departements:
+            # np.unique also restores table order and drops duplicate codes
+            rows = np.unique(
+                np.concatenate(
+                    [
+                        self._by_dept.get(code, np.empty(0, dtype=np.intp))
+                        for code in request.departements
+                    ]
+                )
             )
+        else:
+            rows = np.arange(len(self._codes))
+
+        if request.regions:
+            rows = rows[np.isin(self._region_codes[rows], request.regions)]
+
+        if request.population_min is not None:
+            rows = rows[self._populations[rows] >= request.population_min]
+        if request.population_max is not None:
+            rows = rows[self._populations[rows] <= request.population_max]
 
-        # TODO: Load from shapefile, apply filters, compute scores
-        execution_time = (time.perf_counter() - start_time) * 1000
+        if request.bounds:
+            lats, lngs = self._lats[rows], self._lngs[rows]
+            rows = rows[
+                (lats >= request.bounds.south)
+                & (lats <= request.bounds.north)
+                & (lngs >= request.bounds.west)
+                & (lngs <= request.bounds.east)
+            ]
 
-        return SearchResponse(
-            communes=[],
-            total=0,
-            execution_time_ms=round(execution_time, 2),
+        if request.search_query:
+            query = request.search_query.lower()
+            rows = rows[
+                np.fromiter(
+                    (query in nom.lower() for nom in self._noms[rows]),
+                    dtype=bool,
+                    count=len(rows),
+                )
+            ]
+
+        # Global scores for the remaining communes only
+        weights = request.weights or self._get_default_weights()
+        scores = self._calculate_global_scores(self._score_matrix[rows], weights)
+
+        keep = scores >= request.min_score
+        rows, scores = rows[keep], scores[keep]
+        total = len(rows)
+
+        # Best scores first: partial selection of the requested page, then sort
+        end = min(request.offset + request.limit, total)
+        top = np.argpartition(-scores, end - 1)[:end] if end < total else np.arange(total)
+        top = top[np.argsort(-scores[top], kind="stable")][request.offset : end]
+
+        departement_names = self._departement_names()
+        communes = [
+            self._summary_record(int(row), float(score), departement_names)
+            for row, score in zip(rows[top], scores[top], strict=True)
+        ]
+
+        return {
+            "communes": communes,
+            "total": total,
+            "execution_time_ms": round((time.perf_counter() - start_time) * 1000, 2),
+        }
+
+    def _summary_record(
+        self,
+        row: int,
+        score_global: float,
+        departement_names: dict[str, str],
+    ) -> CommuneSummaryRecord:
+        """Build the summary record of a table row."""
+        dept_code = self._dept_codes[row]
+        return CommuneSummaryRecord(
+            code_insee=self._codes[row],
+            nom=self._noms[row],
+            departement=departement_names.get(dept_code, dept_code),
+            score_global=round(score_global, 1),
+            coordinates=CoordinatesRecord(lat=float(self._lats[row]), lng=float(self._lngs[row])),
         )
 
-    async def get_data_status(self) -> dict[str, Any]:
+    def get_data_status(self) -> dict[str, Any]:
         """
         Get status of available data sources.
 
-        Useful for frontend to show loading/waiting state.
+        Useful for frontend to show loading/waiting state. Reloads the registry
+        if manifest.json changed since it was loaded.
         """
+        self.registry.refresh()
         manifest = self.registry.get_manifest()
 
         return {
@@ -145,7 +475,7 @@ class CommuneService:
                     "id": ds.id,
                     "name": ds.name,
                     "enabled": ds.enabled,
-                    "file_exists": (self.registry.data_dir / ds.file).exists(),
+                    "file_exists": self.registry.dataset_file_exists(ds),
                     "filter_count": len(ds.filters),
                 }
                 for ds in manifest.datasets
@@ -5,10 +5,15 @@ Loads and manages datasets based on the manifest.json configuration.
 Provides a single source of truth for available filters and data.
 """
 
-import json
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+import orjson
 from pydantic import BaseModel
 
 
@@ -82,12 +87,17 @@ class DataRegistry:
     - Loaded data (cached)
     """
 
-    def __init__(self, data_dir: str | Path | None = None):
+    def __init__(
+        self,
+        data_dir: str | Path | None = None,
+        max_cached_datasets: int = 16,
+    ):
         """
         Initialize the registry.
 
         Args:
             data_dir: Path to data directory (defaults to backend/data/)
+            max_cached_datasets: Maximum number of loaded datasets kept in memory
         """
         if data_dir is None:
             # Default to backend/data/ relative to this file
@@ -97,42 +107,104 @@ class DataRegistry:
 
         self._manifest: Manifest | None = None
         self._filters_cache: list[FilterDefinition] | None = None
-        self._datasets_cache: dict[str, Any] = {}
+        self._filters_by_id: dict[str, FilterDefinition] = {}
+        self._filter_api_cache: list[dict[str, Any]] | None = None
+        # Loaded datasets, least recently used first
+        self._datasets_cache: OrderedDict[str, Any] = OrderedDict()
+        self._max_cached_datasets = max_cached_datasets
+        self._communes_gdf: Any = None
+        self._score_matrix: np.ndarray | None = None
+        self._loader_cache: dict[tuple[str, str], Callable[[Path], Any] | None] = {}
+        self._data_version: str | None = None
+        self._manifest_mtime: int | None = None
+        self._dataset_exists: dict[str, bool] = {}
+        self._generation = 0
+        self._manifest_lock = threading.Lock()
+        self._communes_lock = threading.Lock()
 
     @property
     def data_dir(self) -> Path:
         """Get the data directory path."""
         return self._data_dir
 
+    @property
+    def generation(self) -> int:
+        """
+        Get the number of times the cached data was reset.
+
+        Services holding data derived from the registry compare it to the value
+        they were built with, and rebuild after a reset.
+        """
+        return self._generation
+
     def _load_manifest(self) -> Manifest:
-        """Load and parse the manifest.json file."""
+        """Load and parse the manifest.json file (once, even under concurrent calls)."""
         if self._manifest is not None:
             return self._manifest
 
+        with self._manifest_lock:
+            if self._manifest is not None:
+                return self._manifest
+            return self._read_manifest()
+
+    def _read_manifest(self) -> Manifest:
+        """Parse manifest.json and check which dataset files exist."""
         manifest_path = self._data_dir / "manifest.json"
 
-        if not manifest_path.exists():
+        try:
+            self._manifest_mtime = manifest_path.stat().st_mtime_ns
+        except OSError:
             # Return empty manifest if file doesn't exist
+            self._manifest_mtime = None
+            self._dataset_exists = {}
             self._manifest = Manifest()
             return self._manifest
 
-        with open(manifest_path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(manifest_path.read_bytes())
 
-        # Parse datasets and attach dataset_id to filters
-        datasets = []
+        # Attach dataset_id to filters, then validate the whole manifest in
+        # one pass
         for ds_data in data.get("datasets", []):
-            filters = []
             for f_data in ds_data.get("filters", []):
-                filter_def = FilterDefinition(**f_data, dataset_id=ds_data["id"])
-                filters.append(filter_def)
-            ds_data["filters"] = filters
-            datasets.append(DatasetDefinition(**ds_data))
+                f_data["dataset_id"] = ds_data["id"]
+        self._manifest = Manifest.model_validate(data)
 
-        data["datasets"] = datasets
-        self._manifest = Manifest(**data)
+        # Dataset files are checked once per manifest load (see refresh())
+        self._dataset_exists = {
+            ds.id: (self._data_dir / ds.file).exists() for ds in self._manifest.datasets
+        }
         return self._manifest
 
+    def refresh(self) -> bool:
+        """
+        Reload the manifest and cached data if manifest.json changed.
+
+        Called by the data status endpoint, which the frontend polls while
+        waiting for data. Dataset file existence is only checked again after
+        a reload.
+
+        Returns:
+            True if the registry was reset
+        """
+        if self._manifest is None:
+            return False
+
+        try:
+            mtime = (self._data_dir / "manifest.json").stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if mtime == self._manifest_mtime:
+            return False
+
+        self.clear_cache()
+        return True
+
+    def dataset_file_exists(self, dataset: DatasetDefinition) -> bool:
+        """Check if the file of a manifest dataset exists (cached per manifest load)."""
+        self._load_manifest()
+        return self._dataset_exists.get(dataset.id, False)
+
     def get_manifest(self) -> Manifest:
         """Get the loaded manifest."""
         return self._load_manifest()
@@ -155,21 +227,19 @@ class DataRegistry:
                 continue
 
             # Check if file exists
-            file_path = self._data_dir / dataset.file
-            if not file_path.exists():
+            if not self.dataset_file_exists(dataset):
                 continue
 
             filters.extend(dataset.filters)
 
         self._filters_cache = filters
+        self._filters_by_id = {f.id: f for f in filters}
         return filters
 
     def get_filter_by_id(self, filter_id: str) -> FilterDefinition | None:
-        """Get a specific filter by ID."""
-        for f in self.get_available_filters():
-            if f.id == filter_id:
-                return f
-        return None
+        """Get a specific filter by ID (dict lookup)."""
+        self.get_available_filters()
+        return self._filters_by_id.get(filter_id)
 
     def get_dataset(self, dataset_id: str) -> DatasetDefinition | None:
         """Get a dataset definition by ID."""
@@ -188,8 +258,7 @@ class DataRegistry:
             if not dataset.enabled:
                 continue
 
-            file_path = self._data_dir / dataset.file
-            if file_path.exists():
+            if self.dataset_file_exists(dataset):
                 result.append(dataset)
 
         return result
@@ -219,11 +288,21 @@ class DataRegistry:
         Load communes as a GeoDataFrame.
 
         Returns None if communes data is not available or geopandas is not installed.
-        The GeoDataFrame is cached for performance.
+        The GeoDataFrame is cached for performance, in memory and as a GeoParquet
+        copy in data/cache/ (per data version) that later processes read instead
+        of the original file.
         """
-        if "communes_gdf" in self._datasets_cache:
-            return self._datasets_cache["communes_gdf"]
+        if self._communes_gdf is not None:
+            return self._communes_gdf
 
+        # Single-flight: concurrent first calls wait for one load
+        with self._communes_lock:
+            if self._communes_gdf is None:
+                self._communes_gdf = self._read_communes_gdf()
+            return self._communes_gdf
+
+    def _read_communes_gdf(self) -> Any:
+        """Read communes from the GeoParquet cache or the original file (None if unavailable)."""
         if not self.has_communes_data():
             return None
 
@@ -233,13 +312,18 @@ class DataRegistry:
             config = self.get_communes_config()
             file_path = self._data_dir / config.file
 
-            # Load GeoPackage with layer name if specified
-            if config.layer:
-                gdf = gpd.read_file(file_path, layer=config.layer)
-            else:
-                gdf = gpd.read_file(file_path)
+            # GeoParquet copy of the current data version, much faster to read
+            gdf = self.load_cached_gdf("communes")
+
+            if gdf is None:
+                # Load GeoPackage with layer name if specified
+                if config.layer:
+                    gdf = gpd.read_file(file_path, layer=config.layer)
+                else:
+                    gdf = gpd.read_file(file_path)
+
+                self.save_cached_gdf("communes", gdf)
 
-            self._datasets_cache["communes_gdf"] = gdf
             return gdf
         except ImportError:
             return None
@@ -247,6 +331,86 @@ class DataRegistry:
             print(f"Error loading communes: {e}")
             return None
 
+    def get_score_matrix(self) -> np.ndarray | None:
+        """
+        Get the per-filter scores of all communes as one contiguous matrix.
+
+        Shape (communes, filters): rows in communes GeoDataFrame order, columns
+        in get_available_filters() order. Scores (0-100) are read from the
+        commune column `score_<column>` of each filter, the name under which the
+        processing pipelines write indicator scores (e.g. ClimateService
+        writes `score_<indicator>`) into the communes file. Filters without
+        such a column (and missing values) get the neutral score. Built once,
+        reset by clear_cache().
+
+        Returns:
+            float32 matrix, or None if communes data is not available
+        """
+        if self._score_matrix is not None:
+            return self._score_matrix
+
+        gdf = self.load_communes_gdf()
+        if gdf is None:
+            return None
+
+        filters = self.get_available_filters()
+        matrix = np.full((len(gdf), len(filters)), 50.0, dtype=np.float32)
+        for k, f in enumerate(filters):
+            score_column = f"score_{f.column}"
+            if score_column in gdf.columns:
+                matrix[:, k] = gdf[score_column].fillna(50.0).to_numpy(dtype=np.float32)
+
+        self._score_matrix = matrix
+        return matrix
+
+    def get_cache_path(self, name: str) -> Path:
+        """Get the GeoParquet cache path of a derived dataset for the current data version."""
+        return self._data_dir / "cache" / f"{name}_{self.get_data_version()}.parquet"
+
+    def load_cached_gdf(self, name: str) -> Any:
+        """
+        Load a GeoDataFrame cached by save_cached_gdf() for the current data version.
+
+        Returns None if it is not cached (or pyarrow is not installed).
+        """
+        return self._read_parquet_cache(self.get_cache_path(name))
+
+    def save_cached_gdf(self, name: str, gdf: Any) -> None:
+        """Cache a GeoDataFrame derived from the data files as GeoParquet."""
+        self._write_parquet_cache(gdf, self.get_cache_path(name))
+
+    @staticmethod
+    def _read_parquet_cache(path: Path) -> Any:
+        """Read a cached GeoParquet file, or None if missing or pyarrow is not installed."""
+        if not path.exists():
+            return None
+
+        try:
+            import geopandas as gpd
+
+            return gpd.read_parquet(path)
+        except ImportError:
+            return None
+        except Exception as e:
+            print(f"Error reading cache {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write_parquet_cache(gdf: Any, path: Path) -> None:
+        """Write a GeoDataFrame as GeoParquet (skipped if pyarrow is not installed)."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            gdf.to_parquet(tmp_path)
+            tmp_path.replace(path)
+        except Exception as e:
+            print(f"Error writing cache {path}: {e}")
+
     def get_regions(self) -> list[dict[str, str]]:
         """Get reference regions data."""
         return self._load_manifest().reference_data.regions
@@ -272,10 +436,13 @@ class DataRegistry:
         """
         Load and cache dataset data.
 
+        The max_cached_datasets most recently used datasets are kept in memory.
         Returns DataFrame or GeoDataFrame depending on dataset type.
         """
-        if dataset_id in self._datasets_cache:
-            return self._datasets_cache[dataset_id]
+        cached = self._datasets_cache.get(dataset_id)
+        if cached is not None:
+            self._datasets_cache.move_to_end(dataset_id)
+            return cached
 
         dataset = self.get_dataset(dataset_id)
         if dataset is None:
@@ -285,43 +452,101 @@ class DataRegistry:
         if not file_path.exists():
             return None
 
+        loader = self._get_loader(dataset.type, dataset.format)
+        if loader is None:
+            return None
+        data = loader(file_path)
+
+        self._datasets_cache[dataset_id] = data
+        if len(self._datasets_cache) > self._max_cached_datasets:
+            self._datasets_cache.popitem(last=False)
+        return data
+
+    def _get_loader(self, dataset_type: str, dataset_format: str) -> Callable[[Path], Any] | None:
+        """
+        Get the loader function for a dataset type and format.
+
+        Loader modules are imported on first use only, then the function is
+        cached per (type, format). Returns None if the geospatial
+        dependencies of the loader are not installed.
+        """
+        key = (dataset_type, dataset_format)
+        if key in self._loader_cache:
+            return self._loader_cache[key]
+
+        loader: Callable[[Path], Any] | None
         # Load based on type and format
-        if dataset.type == "point_grid":
-            if dataset.format == "meteo_france":
-                from app.data.loaders.tabular import TabularLoader
-                data = TabularLoader.load_meteo_france(file_path)
-            else:
-                from app.data.loaders.tabular import TabularLoader
-                data = TabularLoader.load(file_path)
-        elif dataset.type == "csv":
+        if dataset_type in ("point_grid", "csv"):
             from app.data.loaders.tabular import TabularLoader
-            data = TabularLoader.load(file_path)
+
+            if dataset_type == "point_grid" and dataset_format == "meteo_france":
+                loader = TabularLoader.load_meteo_france
+            else:
+                loader = TabularLoader.load
         else:
             # Shapefile or other - requires geospatial dependencies
             try:
                 from app.data.loaders import ShapefileLoader
-                data = ShapefileLoader.load(file_path)
+                loader = ShapefileLoader.load
             except ImportError:
-                return None
+                loader = None
 
-        self._datasets_cache[dataset_id] = data
-        return data
+        self._loader_cache[key] = loader
+        return loader
+
+    def get_data_version(self) -> str:
+        """
+        Get a fingerprint of the data files (manifest, communes, datasets).
+
+        Based on file mtimes and sizes, so it changes whenever a file is added,
+        removed or modified. Computed once, reset by clear_cache().
+        """
+        if self._data_version is not None:
+            return self._data_version
+
+        manifest = self._load_manifest()
+        paths = [self._data_dir / "manifest.json"]
+        if manifest.communes.file is not None:
+            paths.append(self._data_dir / manifest.communes.file)
+        paths.extend(self._data_dir / ds.file for ds in manifest.datasets)
+
+        digest = hashlib.blake2b(digest_size=8)
+        for path in paths:
+            try:
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+            except OSError:
+                digest.update(f"{path}:missing;".encode())
+
+        self._data_version = digest.hexdigest()
+        return self._data_version
 
     def clear_cache(self) -> None:
         """Clear all cached data."""
         self._manifest = None
         self._filters_cache = None
+        self._filters_by_id = {}
+        self._filter_api_cache = None
         self._datasets_cache.clear()
+        self._communes_gdf = None
+        self._score_matrix = None
+        self._data_version = None
+        self._generation += 1
 
     def get_filter_categories_for_api(self) -> list[dict[str, Any]]:
         """
         Get filter categories formatted for API response.
 
+        Built once per manifest load; the returned list is shared, do not modify it.
+
         Returns:
             List of dicts with id, name, description, icon, unit, weight_default
         """
+        if self._filter_api_cache is not None:
+            return self._filter_api_cache
+
         filters = self.get_available_filters()
-        return [
+        self._filter_api_cache = [
             {
                 "id": f.id,
                 "name": f.name,
@@ -333,6 +558,7 @@ class DataRegistry:
             }
             for f in filters
         ]
+        return self._filter_api_cache
 
 
 # Global registry instance
@@ -15,7 +15,7 @@ class FilterService:
         """Initialize with data registry."""
         self.registry = get_data_registry()
 
-    async def get_filter_options(self) -> FilterOptions:
+    def get_filter_options(self) -> FilterOptions:
         """
         Get available filter options.
 
@@ -43,7 +43,7 @@ class FilterService:
             score_categories=score_categories,
         )
 
-    async def get_filter_categories(self) -> list[dict]:
+    def get_filter_categories(self) -> list[dict]:
         """
         Get detailed filter categories with metadata.
 
@@ -51,7 +51,7 @@ class FilterService:
         """
         return self.registry.get_filter_categories_for_api()
 
-    async def get_default_weights(self) -> dict[str, int]:
+    def get_default_weights(self) -> dict[str, int]:
         """
         Get default weights for all available filters.
 
@@ -5,18 +5,23 @@ Loads commune boundaries from GeoPackage and returns as GeoJSON.
 Uses topology-preserving simplification for performance.
 """
 
+import fcntl
+import gzip
+import hashlib
 import logging
+import os
+import threading
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Any
 
-from shapely.geometry import mapping
+import numpy as np
+import shapely
 
-from app.models.geojson import (
-    CommuneFeature,
-    CommuneFeatureProperties,
-    CommunesGeoJSON,
-)
+from app.core.responses import orjson_dumps
 from app.models.requests import SearchRequest
 from app.services.data_registry import get_data_registry
+from app.services.scoring_service import get_scoring_service
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +29,75 @@ logger = logging.getLogger(__name__)
 class GeoJSONService:
     """Service for GeoJSON generation with topology-preserving simplification."""
 
+    # Global score of communes without per-filter scores (neutral)
+    DEFAULT_SCORE = 50.0
+
     # Simplification tolerance in meters (like QGIS "Simplify Geometries")
     # 200m provides good balance for France-wide view with 34k+ communes
     SIMPLIFY_TOLERANCE_METERS = 200.0
 
+    # Simplify shared borders once, as a topology (topojson), instead of once
+    # per commune: no gaps between neighbors, but much slower to build
+    SIMPLIFY_SHARED_BOUNDARIES = False
+
+    # Maximum number of serialized GeoJSON payloads kept in memory (simplified
+    # geometries only: full-resolution payloads are not cached)
+    SERIALIZED_CACHE_SIZE = 16
+
+    # Number of geometries encoded per shapely.to_geojson call
+    STREAM_BATCH_SIZE = 1000
+
+    # Compression level for pre-gzipped payloads (same as gzip's default)
+    GZIP_COMPRESS_LEVEL = 6
+
     def __init__(self) -> None:
         """Initialize service."""
         self.registry = get_data_registry()
+        self.scoring_service = get_scoring_service()
         self._simplified_cache: dict[str, Any] = {}
+        # Serializes the first build of each variant, keyed by `simplified`
+        self._base_locks = {True: threading.Lock(), False: threading.Lock()}
+        # Per simplified GeoDataFrame: its attribute columns as numpy arrays
+        self._columns_cache: dict[str, dict[str, np.ndarray]] = {}
+        # Spatial index over commune centroids, keyed by `simplified`
+        self._centroid_trees: dict[bool, shapely.STRtree] = {}
+        # GeoJSON encoding of each simplified geometry, keyed by `simplified`
+        self._geometry_json_cache: dict[bool, np.ndarray] = {}
         self._simplification_done = False
+        # Serialized / gzipped simplified payloads, keyed by selection digest
+        self._serialized_cache: dict[bytes, bytes] = {}
+        self._gzipped_cache: dict[bytes, bytes] = {}
+        # Shared gzipped files, keyed by `simplified`
+        self._shared_paths: dict[bool, Path] = {}
+        # Registry generation the caches were built from
+        self._registry_generation = self.registry.generation
+
+    def _sync_with_registry(self) -> None:
+        """Drop every cache built before the registry was last reset."""
+        generation = self.registry.generation
+        if generation == self._registry_generation:
+            return
+
+        self._simplified_cache.clear()
+        self._columns_cache.clear()
+        self._centroid_trees.clear()
+        self._geometry_json_cache.clear()
+        self._serialized_cache.clear()
+        self._gzipped_cache.clear()
+        self._shared_paths.clear()
+        self._registry_generation = generation
+
+    def _store_payload(
+        self,
+        cache: dict[bytes, bytes],
+        key: bytes,
+        payload: bytes,
+    ) -> None:
+        """Store a payload in a bounded cache, evicting the oldest entry."""
+        if len(cache) >= self.SERIALIZED_CACHE_SIZE:
+            # Dicts keep insertion order: the first key is the oldest
+            cache.pop(next(iter(cache)))
+        cache[key] = payload
 
     def _simplify_geometries(self, gdf: Any) -> Any:
         """
@@ -50,21 +115,24 @@ class GeoJSONService:
         # Project to Lambert-93 (France metric CRS) for accurate simplification
         gdf_projected = gdf.to_crs("EPSG:2154")
 
-        # Simplify using Douglas-Peucker with topology preservation
-        gdf_projected = gdf_projected.copy()
-        gdf_projected["geometry"] = gdf_projected["geometry"].simplify(
-            tolerance=self.SIMPLIFY_TOLERANCE_METERS,
-            preserve_topology=True,  # Prevents self-intersections
-        )
+        # Simplify using Douglas-Peucker with topology preservation, in one
+        # vectorized call over the GEOS geometry array
+        geometries = np.asarray(gdf_projected.geometry.values)
+        simplified = None
+        if self.SIMPLIFY_SHARED_BOUNDARIES:
+            simplified = self._simplify_shared_boundaries(gdf_projected)
+        if simplified is None:
+            simplified = shapely.simplify(
+                geometries,
+                self.SIMPLIFY_TOLERANCE_METERS,
+                preserve_topology=True,  # Prevents self-intersections
+            )
+        gdf_projected = gdf_projected.set_geometry(simplified, crs=gdf_projected.crs)
 
-        # Calculate vertex reduction for logging
-        original_vertices = sum(
-            len(g.exterior.coords) if hasattr(g, "exterior") else 0
-            for g in gdf.geometry
-        )
-        simplified_vertices = sum(
-            len(g.exterior.coords) if hasattr(g, "exterior") else 0
-            for g in gdf_projected.geometry
+        # Calculate vertex reduction for logging (all rings and parts)
+        original_vertices = int(shapely.get_num_coordinates(np.asarray(gdf.geometry.values)).sum())
+        simplified_vertices = int(
+            shapely.get_num_coordinates(np.asarray(gdf_projected.geometry.values)).sum()
         )
 
         logger.info(
@@ -75,149 +143,586 @@ class GeoJSONService:
         # Reproject to WGS84 for web mapping
         return gdf_projected.to_crs("EPSG:4326")
 
+    def _simplify_shared_boundaries(self, gdf_projected: Any) -> np.ndarray | None:
+        """
+        Simplify geometries as a topology (topojson), each shared border once.
+
+        Neighboring communes keep identical borders (no gaps or overlaps).
+        Returns None if topojson is not installed or fails, so the caller falls
+        back to per-geometry simplification.
+        """
+        try:
+            import topojson
+        except ImportError:
+            logger.warning("topojson is not installed, simplifying geometries one by one")
+            return None
+
+        try:
+            topology = topojson.Topology(
+                gdf_projected[["geometry"]],
+                prequantize=False,
+                toposimplify=self.SIMPLIFY_TOLERANCE_METERS,
+            )
+            simplified = np.asarray(topology.to_gdf(crs=gdf_projected.crs).geometry.values)
+        except Exception as e:
+            logger.error(f"Error simplifying shared boundaries: {e}")
+            return None
+
+        if len(simplified) != len(gdf_projected):
+            logger.error("Topology simplification changed the number of geometries")
+            return None
+        return simplified
+
     def _get_communes_geojson_base(self, simplified: bool = True) -> Any:
         """
         Get communes as a GeoDataFrame in WGS84, optionally simplified.
 
-        Uses Douglas-Peucker simplification with 100m tolerance.
-        Results are cached for performance.
+        Uses Douglas-Peucker simplification with SIMPLIFY_TOLERANCE_METERS tolerance.
+        Results are cached in memory, and simplified geometries also as
+        GeoParquet per data version and tolerance, so later processes skip
+        reprojection and simplification.
 
-        Returns None if data is not available.
+        Built once per variant, even under concurrent calls, and again after
+        the registry was reset. Returns None if data is not available.
         """
+        self._sync_with_registry()
         cache_key = f"communes_wgs84_{'simplified' if simplified else 'full'}"
         if cache_key in self._simplified_cache:
             return self._simplified_cache[cache_key]
 
+        with self._base_locks[simplified]:
+            if cache_key not in self._simplified_cache:
+                gdf_result = self._build_communes_geojson_base(simplified)
+                if gdf_result is None:
+                    return None
+                self._simplified_cache[cache_key] = gdf_result
+            return self._simplified_cache[cache_key]
+
+    def _build_communes_geojson_base(self, simplified: bool) -> Any:
+        """Load or compute the WGS84 communes GeoDataFrame (None if not available)."""
+        parquet_name = (
+            f"communes_simplified_{self.SIMPLIFY_TOLERANCE_METERS:g}m"
+            f"{'_topo' if self.SIMPLIFY_SHARED_BOUNDARIES else ''}"
+        )
+        if simplified:
+            gdf_result = self.registry.load_cached_gdf(parquet_name)
+            if gdf_result is not None:
+                return gdf_result
+
         gdf = self.registry.load_communes_gdf()
         if gdf is None:
             return None
 
         try:
-            gdf_result = (
-                self._simplify_geometries(gdf)
-                if simplified
-                else gdf.to_crs("EPSG:4326")
-            )
+            if simplified:
+                gdf_result = self._simplify_geometries(gdf)
+                self.registry.save_cached_gdf(parquet_name, gdf_result)
+            else:
+                gdf_result = gdf.to_crs("EPSG:4326")
 
-            self._simplified_cache[cache_key] = gdf_result
             return gdf_result
 
         except Exception as e:
             logger.error(f"Error processing communes: {e}")
             return None
 
-    async def get_communes_geojson(
+    def _get_communes_columns(self, gdf: Any, simplified: bool = True) -> dict[str, np.ndarray]:
+        """
+        Get the attributes used for filtering and properties as numpy arrays.
+
+        Extracted once per cached GeoDataFrame, so filters run as vectorized
+        masks instead of per-row lookups. Missing columns get default values
+        and missing populations count as 0.
+
+        Args:
+            gdf: WGS84 GeoDataFrame returned by _get_communes_geojson_base()
+            simplified: Whether gdf holds the simplified geometries
+
+        Returns:
+            Arrays aligned with gdf rows: code_insee, nom, nom_lower,
+            population, departement, region, score_global, and centroid
+            lng / lat; plus population_order / population_sorted, the row
+            positions by increasing population and the sorted populations
+        """
+        cache_key = f"communes_columns_{'simplified' if simplified else 'full'}"
+        columns = self._columns_cache.get(cache_key)
+        if columns is not None:
+            return columns
+
+        config = self.registry.get_communes_config()
+        n_communes = len(gdf)
+
+        def text_column(name: str) -> np.ndarray:
+            if name not in gdf.columns:
+                return np.full(n_communes, "")
+            values: np.ndarray = gdf[name].astype(str).to_numpy(dtype=str)
+            return values
+
+        if config.population_column in gdf.columns:
+            populations = gdf[config.population_column].fillna(0).to_numpy(dtype=np.int64)
+        else:
+            populations = np.zeros(n_communes, dtype=np.int64)
+
+        population_order = np.argsort(populations, kind="stable")
+
+        centroids = shapely.centroid(np.asarray(gdf.geometry.values))
+
+        noms = text_column(config.name_column)
+
+        columns = {
+            "code_insee": text_column(config.id_column),
+            "nom": noms,
+            # Lowercased once for case-insensitive search
+            "nom_lower": np.char.lower(noms),
+            "population": populations,
+            # Row positions by increasing population, for range queries
+            "population_order": population_order,
+            "population_sorted": populations[population_order],
+            "departement": text_column(config.department_column),
+            "region": text_column(config.region_column),
+            # Same global scores (default weights) as the communes list
+            "score_global": self._default_global_scores(n_communes),
+            "lng": shapely.get_x(centroids),
+            "lat": shapely.get_y(centroids),
+        }
+        self._columns_cache[cache_key] = columns
+        return columns
+
+    def _default_global_scores(self, n_communes: int) -> np.ndarray:
+        """Get the default-weights global scores of the registry (neutral if unavailable)."""
+        scores = self.scoring_service.get_default_global_scores()
+        if scores is None or len(scores) != n_communes:
+            return np.full(n_communes, self.DEFAULT_SCORE, dtype=np.float32)
+        return scores
+
+    def _search_global_scores(
+        self,
+        columns: dict[str, np.ndarray],
+        request: SearchRequest,
+    ) -> np.ndarray:
+        """
+        Get the global scores of a search, with its weights if it has any.
+
+        Computed like the communes search: the registry score matrix weighted
+        by the request weights, else the default-weights scores.
+        """
+        default_scores = columns["score_global"]
+        if not request.weights:
+            return default_scores
+
+        score_matrix = self.registry.get_score_matrix()
+        if score_matrix is None or len(score_matrix) != len(default_scores):
+            return default_scores
+        return self.scoring_service.calculate_global_scores_batch(score_matrix, request.weights)
+
+    def _get_centroid_tree(self, gdf: Any, simplified: bool = True) -> shapely.STRtree:
+        """Get a spatial index over the commune centroids (positions match gdf rows)."""
+        tree = self._centroid_trees.get(simplified)
+        if tree is None:
+            columns = self._get_communes_columns(gdf, simplified)
+            tree = shapely.STRtree(shapely.points(columns["lng"], columns["lat"]))
+            self._centroid_trees[simplified] = tree
+        return tree
+
+    def _batch_properties(
+        self,
+        columns: dict[str, np.ndarray],
+        positions: np.ndarray,
+        score_global: np.ndarray,
+    ) -> list[dict[str, Any]]:
+        """Build the feature properties of the selected rows (scores rounded to 0.1)."""
+        return [
+            self._feature_properties(code_insee, nom, score, population)
+            for code_insee, nom, score, population in zip(
+                columns["code_insee"][positions].tolist(),
+                columns["nom"][positions].tolist(),
+                np.round(score_global[positions].astype(np.float64), 1).tolist(),
+                columns["population"][positions].tolist(),
+                strict=True,
+            )
+        ]
+
+    @staticmethod
+    def _feature_properties(
+        code_insee: str,
+        nom: str,
+        score_global: float,
+        population: int,
+    ) -> dict[str, Any]:
+        """
+        Build feature properties as a plain dict.
+
+        Mirrors CommuneFeatureProperties without instantiating the model.
+        """
+        return {
+            "code_insee": code_insee,
+            "nom": nom,
+            "score_global": score_global,
+            "population": population,
+        }
+
+    @staticmethod
+    def _encode_feature(properties: dict[str, Any], geometry: bytes) -> bytes:
+        """Encode a GeoJSON Feature from its properties and geometry JSON."""
+        return b"".join((
+            b'{"type":"Feature","properties":',
+            orjson_dumps(properties),
+            b',"geometry":',
+            geometry,
+            b"}",
+        ))
+
+    def _get_geometry_json(self, gdf: Any, simplified: bool) -> np.ndarray | None:
+        """
+        Get the GeoJSON encoding of every geometry of the simplified communes.
+
+        Encoded once (shapely.to_geojson) and reused by every request. Full
+        geometries are not cached, to keep memory bounded: returns None.
+        """
+        if not simplified:
+            return None
+
+        geometry_json = self._geometry_json_cache.get(simplified)
+        if geometry_json is None:
+            geometry_json = np.array(
+                [
+                    geometry.encode() if geometry is not None else b"null"
+                    for geometry in shapely.to_geojson(np.asarray(gdf.geometry.values))
+                ],
+                dtype=object,
+            )
+            self._geometry_json_cache[simplified] = geometry_json
+        return geometry_json
+
+    def _iter_encoded_features(
+        self,
+        gdf: Any,
+        positions: np.ndarray,
+        simplified: bool = True,
+        separator: bytes = b",",
+        score_global: np.ndarray | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Encode selected rows as GeoJSON Features, one batch at a time.
+
+        Properties are built per batch of STREAM_BATCH_SIZE rows, so only one
+        batch of Python objects is alive at once. Simplified geometries come
+        from the cached GeoJSON encodings; full geometries are written by GEOS
+        (shapely.to_geojson) per batch, without intermediate coordinate dicts.
+
+        Args:
+            gdf: WGS84 GeoDataFrame the rows were selected from
+            positions: Row positions of the selected communes, in output order
+            simplified: Whether gdf holds the simplified geometries
+            separator: Separator between the Features of a batch
+            score_global: Global scores of all rows (defaults to the
+                default-weights scores)
+
+        Yields:
+            Encoded Features of each batch, joined by separator
+        """
+        if len(positions) == 0:
+            return
+
+        columns = self._get_communes_columns(gdf, simplified)
+        geometry_json = self._get_geometry_json(gdf, simplified)
+        if score_global is None:
+            score_global = columns["score_global"]
+
+        for start in range(0, len(positions), self.STREAM_BATCH_SIZE):
+            batch = positions[start:start + self.STREAM_BATCH_SIZE]
+            if geometry_json is not None:
+                geometries = geometry_json[batch]
+            else:
+                geometries = [
+                    geometry.encode() if geometry is not None else b"null"
+                    for geometry in shapely.to_geojson(gdf.geometry.values[batch])
+                ]
+
+            yield separator.join(
+                self._encode_feature(properties, geometry)
+                for properties, geometry in zip(
+                    self._batch_properties(columns, batch, score_global),
+                    geometries,
+                    strict=True,
+                )
+            )
+
+    def _iter_feature_collection(
+        self,
+        gdf: Any,
+        positions: np.ndarray,
+        simplified: bool = True,
+        score_global: np.ndarray | None = None,
+    ) -> Iterator[bytes]:
+        """Encode selected rows as a GeoJSON FeatureCollection, in chunks."""
+        yield b'{"type":"FeatureCollection","features":['
+        chunks = self._iter_encoded_features(gdf, positions, simplified, score_global=score_global)
+        for index, chunk in enumerate(chunks):
+            yield b"," + chunk if index else chunk
+        yield b"]}"
+
+    def _encode_feature_collection(
+        self,
+        gdf: Any,
+        positions: np.ndarray,
+        simplified: bool = True,
+    ) -> bytes:
+        """Encode selected rows as a GeoJSON FeatureCollection."""
+        return b"".join(self._iter_feature_collection(gdf, positions, simplified))
+
+    def _select_communes_positions(
+        self,
+        gdf: Any,
+        min_score: float,
+        simplified: bool = True,
+    ) -> np.ndarray:
+        """Select the row positions of the communes above min_score."""
+        columns = self._get_communes_columns(gdf, simplified)
+        return np.flatnonzero(columns["score_global"] >= min_score)
+
+    @staticmethod
+    def _selection_key(positions: np.ndarray) -> bytes:
+        """Key a payload by its selected rows, so equivalent filters share one entry."""
+        return hashlib.blake2b(positions.tobytes(), digest_size=16).digest()
+
+    def get_communes_geojson_bytes(
         self,
         min_score: float = 0,
         simplified: bool = True,
-    ) -> CommunesGeoJSON:
+    ) -> bytes:
         """
-        Get all communes as GeoJSON.
+        Get all communes as serialized GeoJSON bytes.
 
-        Returns empty GeoJSON if communes data is not available.
+        Simplified payloads are cached per selected rows, so repeated map loads
+        (and min_score values selecting the same communes) skip feature
+        construction and JSON encoding entirely. Full-resolution payloads are
+        too large to keep in memory and are encoded per call.
         """
         gdf = self._get_communes_geojson_base(simplified)
         if gdf is None:
-            return CommunesGeoJSON(features=[])
+            return self._encode_feature_collection(None, np.empty(0, dtype=np.intp))
 
-        config = self.registry.get_communes_config()
-        features: list[CommuneFeature] = []
-
-        for _, row in gdf.iterrows():
-            # Get column values safely
-            code_insee = str(row.get(config.id_column, ""))
-            nom = str(row.get(config.name_column, ""))
-            population = int(row.get(config.population_column, 0) or 0)
-
-            # Default score of 50 (neutral) until we compute real scores
-            score_global = 50.0
-
-            if score_global < min_score:
-                continue
-
-            # Convert geometry to GeoJSON dict
-            geom_dict = mapping(row.geometry)
-
-            feature = CommuneFeature(
-                properties=CommuneFeatureProperties(
-                    code_insee=code_insee,
-                    nom=nom,
-                    score_global=score_global,
-                    population=population,
-                ),
-                geometry=geom_dict,
-            )
-            features.append(feature)
+        positions = self._select_communes_positions(gdf, min_score, simplified)
+        if not simplified:
+            return self._encode_feature_collection(gdf, positions, simplified)
+
+        key = self._selection_key(positions)
+        cached = self._serialized_cache.get(key)
+        if cached is not None:
+            return cached
+
+        payload = self._encode_feature_collection(gdf, positions, simplified)
+        self._store_payload(self._serialized_cache, key, payload)
+        return payload
+
+    def iter_communes_ndgeojson(
+        self,
+        min_score: float = 0,
+        simplified: bool = True,
+    ) -> Iterator[bytes]:
+        """
+        Stream communes as newline-delimited GeoJSON Features.
+
+        Features are encoded batch by batch, so the full collection is never
+        held in memory. Yields nothing if communes data is not available.
+        """
+        gdf = self._get_communes_geojson_base(simplified)
+        if gdf is None:
+            return
+
+        positions = self._select_communes_positions(gdf, min_score, simplified)
+        for chunk in self._iter_encoded_features(gdf, positions, simplified, separator=b"\n"):
+            yield chunk + b"\n"
+
+    def get_shared_blob_path(self, simplified: bool = True) -> Path:
+        """
+        Get the path of the shared pre-gzipped GeoJSON file.
+
+        Stored in the cache directory of the data directory, next to the
+        GeoParquet caches. The data version is part of the file name, so a data
+        update never serves a stale file.
+        """
+        variant = "simplified" if simplified else "full"
+        version = self.registry.get_data_version()
+        return self.registry.data_dir / "cache" / f"communes_{variant}_{version}.geojson.gz"
+
+    def export_communes_geojson_gzip(self, simplified: bool = True) -> Path | None:
+        """
+        Write the gzipped GeoJSON of all communes to disk.
+
+        With several workers, only one builds the file: the build holds an
+        exclusive lock (flock) on a lock file next to it, and the workers
+        waiting on the lock reuse the file once it is released. The endpoint
+        streams it from disk, so the compressed payload lives once in the OS
+        page cache instead of once per process.
+
+        Returns:
+            Path of the file, or None if communes data is not available
+        """
+        if not self.registry.has_communes_data():
+            return None
+
+        path = self.get_shared_blob_path(simplified)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lock_path = path.with_name(f"{path.name}.lock")
+            with lock_path.open("wb") as lock_file:
+                # Released when the file is closed (or the process dies)
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                if not path.exists() and not self._write_communes_geojson_gzip(path, simplified):
+                    return None
+
+        self._shared_paths[simplified] = path
+
+        return path
+
+    def _write_communes_geojson_gzip(self, path: Path, simplified: bool) -> bool:
+        """
+        Write the gzipped GeoJSON of all communes to path.
 
-        return CommunesGeoJSON(features=features)
+        Returns:
+            False if communes data is not available
+        """
+        gdf = self._get_communes_geojson_base(simplified)
+        if gdf is None:
+            return False
+
+        positions = self._select_communes_positions(gdf, 0, simplified)
+        payload = self._encode_feature_collection(gdf, positions, simplified)
+        compressed = gzip.compress(payload, compresslevel=self.GZIP_COMPRESS_LEVEL, mtime=0)
+
+        # Write then rename, so readers never see a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(compressed)
+        tmp_path.replace(path)
+        return True
+
+    def get_exported_gzip_path(self, simplified: bool = True) -> Path | None:
+        """Get the shared gzipped file written by export_communes_geojson_gzip(), if any."""
+        self._sync_with_registry()
+        return self._shared_paths.get(simplified)
+
+    def get_communes_geojson_gzip(
+        self,
+        min_score: float = 0,
+        simplified: bool = True,
+    ) -> bytes:
+        """
+        Get all communes as gzip-compressed GeoJSON bytes.
+
+        Simplified payloads are compressed once per selected rows and served
+        as is with `Content-Encoding: gzip`, so they are not recompressed per
+        request; full-resolution payloads are not cached.
+        Without a score filter, the endpoint serves the file written by
+        export_communes_geojson_gzip() instead, when available.
+        """
+        key: bytes | None = None
+        gdf = self._get_communes_geojson_base(simplified) if simplified else None
+        if gdf is not None:
+            key = self._selection_key(self._select_communes_positions(gdf, min_score))
+            cached = self._gzipped_cache.get(key)
+            if cached is not None:
+                return cached
+
+        payload = self.get_communes_geojson_bytes(min_score=min_score, simplified=simplified)
+        # mtime=0 keeps the compressed bytes deterministic
+        compressed = gzip.compress(payload, compresslevel=self.GZIP_COMPRESS_LEVEL, mtime=0)
+
+        if key is not None:
+            self._store_payload(self._gzipped_cache, key, compressed)
+
+        return compressed
 
-    async def get_filtered_communes_geojson(
+    def iter_filtered_communes_geojson(
         self,
         request: SearchRequest,
         simplified: bool = True,
-    ) -> CommunesGeoJSON:
+    ) -> Iterator[bytes]:
         """
-        Get filtered communes as GeoJSON.
+        Stream filtered communes as a GeoJSON FeatureCollection, in chunks.
 
-        Returns empty GeoJSON if communes data is not available.
+        Features are encoded batch by batch, so the full collection is never
+        held in memory. Yields an empty FeatureCollection if communes data is
+        not available.
         """
         gdf = self._get_communes_geojson_base(simplified)
         if gdf is None:
-            return CommunesGeoJSON(features=[])
+            yield from self._iter_feature_collection(None, np.empty(0, dtype=np.intp))
+            return
 
-        config = self.registry.get_communes_config()
-        features: list[CommuneFeature] = []
-
-        for _, row in gdf.iterrows():
-            # Get column values safely
-            code_insee = str(row.get(config.id_column, ""))
-            nom = str(row.get(config.name_column, ""))
-            population = int(row.get(config.population_column, 0) or 0)
-            dept_code = str(row.get(config.department_column, ""))
-            region_code = str(row.get(config.region_column, ""))
-
-            # Apply filters
-            if request.population_min is not None and population < request.population_min:
-                continue
-            if request.population_max is not None and population > request.population_max:
-                continue
-
-            if request.departements and dept_code not in request.departements:
-                continue
-
-            if request.regions and region_code not in request.regions:
-                continue
-
-            if request.search_query and request.search_query.lower() not in nom.lower():
-                continue
-
-            # Viewport bounds filter
-            if request.bounds:
-                centroid = row.geometry.centroid
-                if not (
-                    request.bounds.south <= centroid.y <= request.bounds.north
-                    and request.bounds.west <= centroid.x <= request.bounds.east
-                ):
-                    continue
-
-            # Default score of 50 (neutral)
-            score_global = 50.0
-
-            if score_global < request.min_score:
-                continue
-
-            # Convert geometry to GeoJSON dict
-            geom_dict = mapping(row.geometry)
-
-            feature = CommuneFeature(
-                properties=CommuneFeatureProperties(
-                    code_insee=code_insee,
-                    nom=nom,
-                    score_global=score_global,
-                    population=population,
-                ),
-                geometry=geom_dict,
+        columns = self._get_communes_columns(gdf, simplified)
+        score_global = self._search_global_scores(columns, request)
+        positions = self._select_filtered_positions(gdf, request, simplified, score_global)
+        yield from self._iter_feature_collection(gdf, positions, simplified, score_global)
+
+    def _select_filtered_positions(
+        self,
+        gdf: Any,
+        request: SearchRequest,
+        simplified: bool = True,
+        score_global: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Select the row positions of the communes matching the search filters.
+
+        min_score applies to score_global (global scores of all rows, defaults
+        to the default-weights scores).
+        """
+        columns = self._get_communes_columns(gdf, simplified)
+        if score_global is None:
+            score_global = columns["score_global"]
+
+        # Viewport bounds filter: only the communes whose centroid falls in
+        # the viewport (spatial index query) go through the other filters
+        candidates: np.ndarray | None = None
+        if request.bounds:
+            viewport = shapely.box(
+                request.bounds.west,
+                request.bounds.south,
+                request.bounds.east,
+                request.bounds.north,
             )
-            features.append(feature)
+            candidates = np.sort(self._get_centroid_tree(gdf, simplified).query(viewport))
+        elif request.population_min is not None or request.population_max is not None:
+            # Population range: binary search in the population-sorted order
+            populations = columns["population_sorted"]
+            start = (
+                np.searchsorted(populations, request.population_min, side="left")
+                if request.population_min is not None
+                else 0
+            )
+            stop = (
+                np.searchsorted(populations, request.population_max, side="right")
+                if request.population_max is not None
+                else len(populations)
+            )
+            candidates = np.sort(columns["population_order"][start:stop])
+
+        def values(name: str) -> np.ndarray:
+            return columns[name] if candidates is None else columns[name][candidates]
+
+        # Combine all filters into one boolean mask, cheapest first: numeric
+        # comparisons, then code lookups, then the name substring search
+        scores = score_global if candidates is None else score_global[candidates]
+        mask = scores >= request.min_score
+
+        if request.population_min is not None:
+            mask &= values("population") >= request.population_min
+        if request.population_max is not None:
+            mask &= values("population") <= request.population_max
+
+        if request.departements:
+            mask &= np.isin(values("departement"), request.departements)
+
+        if request.regions:
+            mask &= np.isin(values("region"), request.regions)
+
+        # Substring search only on the communes that passed the other filters
+        if request.search_query:
+            query = request.search_query.lower()
+            survivors = np.flatnonzero(mask)
+            mask[survivors] = np.char.find(values("nom_lower")[survivors], query) >= 0
 
-        return CommunesGeoJSON(features=features)
+        return np.flatnonzero(mask) if candidates is None else candidates[mask]
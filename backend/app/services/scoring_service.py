@@ -4,15 +4,65 @@ Scoring service - calculates weighted scores for communes.
 Uses DataRegistry to get default weights from manifest.
 """
 
+from collections.abc import Callable
+from math import isfinite
+from typing import Any
+
+import numpy as np
+
 from app.services.data_registry import get_data_registry
 
 
 class ScoringService:
     """Service for score calculation logic."""
 
+    # Maximum number of scorers kept in memory (one per weight set)
+    SCORER_CACHE_SIZE = 64
+
+    __slots__ = (
+        "_default_scores",
+        "_default_scores_matrix",
+        "_default_weights",
+        "_default_weights_arr",
+        "_filter_index",
+        "_indexed_filters",
+        "_scorers",
+        "registry",
+    )
+
     def __init__(self) -> None:
         """Initialize with data registry."""
         self.registry = get_data_registry()
+        # Filter ID -> column of score matrices (registry filter order), and
+        # the filter list it was built from
+        self._filter_index: dict[str, int] = {}
+        self._indexed_filters: list[Any] | None = None
+        # Default weights, as a dict and as a vector in column order
+        self._default_weights: dict[str, float] = {}
+        self._default_weights_arr = np.empty(0, dtype=np.float32)
+        # Global scores of all communes with the default weights, and the
+        # registry score matrix they were computed from
+        self._default_scores: np.ndarray | None = None
+        self._default_scores_matrix: np.ndarray | None = None
+        # Scorers by sorted weight items, oldest first
+        self._scorers: dict[tuple[tuple[str, float], ...], Callable[[np.ndarray], np.ndarray]] = {}
+
+    def _refresh_filters(self) -> None:
+        """Rebuild the filter index and default weights when the filters change."""
+        filters = self.registry.get_available_filters()
+        if filters is self._indexed_filters:
+            return
+
+        self._filter_index = {f.id: k for k, f in enumerate(filters)}
+        self._default_weights = {f.id: float(f.weight_default) for f in filters}
+        self._default_weights_arr = np.array(
+            [f.weight_default for f in filters],
+            dtype=np.float32,
+        )
+        self._default_weights_arr.flags.writeable = False
+        self._indexed_filters = filters
+        # Scorers hold column indices of the previous filter list
+        self._scorers.clear()
 
     def calculate_global_score(
         self,
@@ -22,32 +72,206 @@ class ScoringService:
         """
         Calculate weighted global score.
 
+        A filter counts when its weight is positive and it has a finite score.
+        A plain loop: with a dozen filters, building arrays costs more than
+        the reduction itself.
+
         Args:
             scores: Individual category scores for a commune (filter_id -> score)
             weights: Weight for each category (filter_id -> weight 0-100)
 
         Returns:
-            Weighted average score (0-100)
+            Weighted average score (0-100), unrounded: round when serializing
         """
-        total_weight = 0.0
         weighted_sum = 0.0
+        total_weight = 0.0
 
         for filter_id, weight in weights.items():
-            if weight > 0 and filter_id in scores:
-                score_value = scores[filter_id]
-                weighted_sum += score_value * weight
-                total_weight += weight
+            if weight > 0:
+                score = scores.get(filter_id)
+                if score is not None and isfinite(score):
+                    weighted_sum += score * weight
+                    total_weight += weight
 
         if total_weight == 0:
             return 50.0  # Return neutral score if no weights
 
-        return round(weighted_sum / total_weight, 1)
+        return weighted_sum / total_weight
+
+    def calculate_global_scores_batch(
+        self,
+        score_matrix: np.ndarray,
+        weights: dict[str, float],
+    ) -> np.ndarray:
+        """
+        Calculate weighted global scores for many communes at once.
+
+        Weights are converted to a vector once, then all communes are scored
+        by a single matrix-vector product. Filters without a positive weight
+        are ignored; the score is neutral (50) when no weight applies.
+
+        Args:
+            score_matrix: Scores (0-100), shape (communes, filters), columns in
+                available filter order
+            weights: Dict of filter_id -> weight (0-100)
+
+        Returns:
+            Weighted average scores (0-100), shape (communes,)
+        """
+        self._refresh_filters()
+        scorer = self._get_scorer(tuple(sorted(weights.items())))
+        return scorer(score_matrix)
+
+    def _get_scorer(
+        self,
+        weights_key: tuple[tuple[str, float], ...],
+    ) -> Callable[[np.ndarray], np.ndarray]:
+        """
+        Build a scoring function specialized for one set of weights.
+
+        Search requests often reuse the same weight preset, so the weight
+        vector and its scorer are built once per preset (SCORER_CACHE_SIZE
+        latest presets kept).
+
+        Args:
+            weights_key: Sorted (filter_id, weight) pairs
+
+        Returns:
+            Function mapping a score matrix (communes, filters) to global scores
+        """
+        scorer = self._scorers.get(weights_key)
+        if scorer is not None:
+            return scorer
+
+        filter_index = self._filter_index
+        weight_vector = np.zeros(len(filter_index), dtype=np.float32)
+        for filter_id, weight in weights_key:
+            k = filter_index.get(filter_id)
+            if k is not None and weight > 0:
+                weight_vector[k] = weight
+
+        scorer = self._make_scorer(weight_vector)
+        if len(self._scorers) >= self.SCORER_CACHE_SIZE:
+            # Dicts keep insertion order: the first key is the oldest
+            self._scorers.pop(next(iter(self._scorers)))
+        self._scorers[weights_key] = scorer
+        return scorer
+
+    @staticmethod
+    def _make_scorer(weight_vector: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        """
+        Build the scoring function of a weight vector.
+
+        Only columns with a positive weight enter the product, and the weights
+        are divided by their total once, so each commune costs a single
+        weighted sum instead of a sum and a division.
+
+        Args:
+            weight_vector: Weights (0-100), shape (filters,), in column order
+                (converted to float32)
+
+        Returns:
+            Function mapping a score matrix (communes, filters) to global scores
+        """
+        # float32 like the score matrix: a float64 vector would upcast the
+        # whole matrix in the product
+        weight_vector = np.asarray(weight_vector, dtype=np.float32)
+        active_cols = np.flatnonzero(weight_vector > 0)
+
+        if len(active_cols) == 0:
+
+            def score_neutral(score_matrix: np.ndarray) -> np.ndarray:
+                # Default neutral score
+                return np.full(len(score_matrix), 50.0, dtype=np.float32)
+
+            return score_neutral
+
+        weights = weight_vector[active_cols]
+        normalized = weights * weights.dtype.type(1.0 / weights.sum())
+
+        if len(active_cols) == len(weight_vector):
+
+            def score_all(score_matrix: np.ndarray) -> np.ndarray:
+                result: np.ndarray = score_matrix @ normalized
+                return result
+
+            return score_all
+
+        def score(score_matrix: np.ndarray) -> np.ndarray:
+            result: np.ndarray = score_matrix[:, active_cols] @ normalized
+            return result
+
+        return score
+
+    def calculate_global_scores_with_fixed_weights(
+        self,
+        score_matrix: np.ndarray,
+        weight_vector: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Calculate weighted global scores for many communes sharing one weight vector.
+
+        Filters without a positive weight are ignored; the score is neutral
+        (50) when no weight applies.
+
+        Args:
+            score_matrix: Scores (0-100), shape (communes, filters)
+            weight_vector: Weights (0-100), shape (filters,), in column order
+
+        Returns:
+            Weighted average scores (0-100), shape (communes,)
+        """
+        return self._make_scorer(weight_vector)(score_matrix)
 
     def get_default_weights(self) -> dict[str, float]:
         """
         Get default weights for all available filters.
 
+        Returns weights from manifest configuration (a copy of the cached dict).
+        """
+        self._refresh_filters()
+        return self._default_weights.copy()
+
+    def get_default_weights_array(self) -> np.ndarray:
+        """
+        Get default weights as a read-only vector, in score matrix column order.
+
         Returns weights from manifest configuration.
         """
-        filters = self.registry.get_available_filters()
-        return {f.id: float(f.weight_default) for f in filters}
+        self._refresh_filters()
+        return self._default_weights_arr
+
+    def get_default_global_scores(self) -> np.ndarray | None:
+        """
+        Get the global scores of all communes with the default weights.
+
+        Computed once per registry score matrix and shared by the commune list
+        and the map, so both show the same scores.
+
+        Returns:
+            Scores (0-100) in communes GeoDataFrame order, or None if communes
+            data is not available
+        """
+        score_matrix = self.registry.get_score_matrix()
+        if score_matrix is None:
+            return None
+
+        if self._default_scores_matrix is not score_matrix or self._default_scores is None:
+            self._default_scores = self.calculate_global_scores_with_fixed_weights(
+                score_matrix,
+                self.get_default_weights_array(),
+            )
+            self._default_scores_matrix = score_matrix
+        return self._default_scores
+
+
+# Global scoring service instance
+_scoring_service: ScoringService | None = None
+
+
+def get_scoring_service() -> ScoringService:
+    """Get the global scoring service (singleton)."""
+    global _scoring_service
+    if _scoring_service is None:
+        _scoring_service = ScoringService()
+    return _scoring_service
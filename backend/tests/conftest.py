@@ -2,8 +2,10 @@
 Pytest configuration and fixtures.
 """
 
+from collections.abc import Iterator
+
 import pytest
-from httpx import ASGITransport, AsyncClient
+from fastapi.testclient import TestClient
 
 from app.main import app
 
@@ -14,11 +16,12 @@ def anyio_backend() -> str:
     return "asyncio"
 
 
-@pytest.fixture
-async def client() -> AsyncClient:
-    """Create async HTTP client for testing."""
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test",
-    ) as ac:
-        yield ac
+@pytest.fixture(scope="session")
+def sync_client() -> Iterator[TestClient]:
+    """
+    Create synchronous HTTP client for testing, shared by the whole session.
+
+    The application lifespan runs once around the session.
+    """
+    with TestClient(app) as tc:
+        yield tc
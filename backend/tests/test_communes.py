@@ -5,60 +5,74 @@ Note: These tests work without actual commune data (shapefile).
 The API returns empty results or 404 when no data is available.
 """
 
+from collections.abc import Callable
+from typing import Any
+
 import pytest
-from httpx import AsyncClient
+from fastapi.testclient import TestClient
 
 
-@pytest.mark.anyio
-async def test_list_communes(client: AsyncClient) -> None:
-    """Test listing communes returns paginated results (empty without data)."""
-    response = await client.get("/api/v1/communes")
-    
-    assert response.status_code == 200
-    data = response.json()
-    
+def _check_list(data: dict[str, Any]) -> None:
+    """Check a communes list is paginated (empty without data)."""
     assert "data" in data
     assert "total" in data
     assert "limit" in data
     assert "offset" in data
     assert "has_more" in data
-    
+
     # Without communes data, the list should be empty
     # This is expected behavior - no data until shapefile is added
 
 
-@pytest.mark.anyio
-async def test_list_communes_pagination(client: AsyncClient) -> None:
-    """Test communes pagination parameters."""
-    response = await client.get("/api/v1/communes?limit=5&offset=0")
-    
-    assert response.status_code == 200
-    data = response.json()
-    
+def _check_pagination(data: dict[str, Any]) -> None:
+    """Check communes pagination parameters are applied."""
     assert data["limit"] == 5
     assert data["offset"] == 0
     assert len(data["data"]) <= 5
+    assert "next_cursor" in data
+
+
+@pytest.mark.parametrize(
+    ("url", "expected_status", "check"),
+    [
+        ("/api/v1/communes", 200, _check_list),
+        ("/api/v1/communes?limit=5&offset=0", 200, _check_pagination),
+        # Non-existent commune
+        ("/api/v1/communes/99999", 404, None),
+        # Without a communes shapefile, any commune lookup should return 404
+        ("/api/v1/communes/75056", 404, None),
+    ],
+    ids=["list", "pagination", "not_found", "not_found_without_data"],
+)
+def test_communes_get(
+    sync_client: TestClient,
+    url: str,
+    expected_status: int,
+    check: Callable[[dict[str, Any]], None] | None,
+) -> None:
+    """Test listing communes and fetching a single commune."""
+    response = sync_client.get(url)
 
+    assert response.status_code == expected_status
+    if check is not None:
+        check(response.json())
 
-@pytest.mark.anyio
-async def test_get_commune_not_found(client: AsyncClient) -> None:
-    """Test 404 for non-existent commune."""
-    response = await client.get("/api/v1/communes/99999")
+
+def test_list_communes_invalid_cursor(sync_client: TestClient) -> None:
+    """Test 400 for a malformed pagination cursor."""
+    response = sync_client.get("/api/v1/communes?cursor=not-a-cursor")
     
-    assert response.status_code == 404
+    assert response.status_code == 400
 
 
-@pytest.mark.anyio
-async def test_get_commune_not_found_without_data(client: AsyncClient) -> None:
-    """Test 404 when communes data is not available."""
-    # Without a communes shapefile, any commune lookup should return 404
-    response = await client.get("/api/v1/communes/75056")
+def test_list_communes_invalid_sort_field(sync_client: TestClient) -> None:
+    """Test 400 for a field that cannot be sorted on."""
+    response = sync_client.get("/api/v1/communes?sort_by=geometry")
     
-    assert response.status_code == 404
+    assert response.status_code == 400
 
 
-@pytest.mark.anyio
-async def test_search_communes(client: AsyncClient) -> None:
+def test_search_communes(sync_client: TestClient) -> None:
     """Test searching communes with filters."""
     search_request = {
         "weights": {
@@ -69,7 +83,7 @@ async def test_search_communes(client: AsyncClient) -> None:
         "limit": 10,
     }
     
-    response = await client.post("/api/v1/communes/search", json=search_request)
+    response = sync_client.post("/api/v1/communes/search", json=search_request)
     
     assert response.status_code == 200
     data = response.json()
@@ -79,8 +93,7 @@ async def test_search_communes(client: AsyncClient) -> None:
     assert "execution_time_ms" in data
 
 
-@pytest.mark.anyio
-async def test_search_communes_with_population_filter(client: AsyncClient) -> None:
+def test_search_communes_with_population_filter(sync_client: TestClient) -> None:
     """Test searching communes with population filter."""
     search_request = {
         "population_min": 100000,
@@ -88,9 +101,21 @@ async def test_search_communes_with_population_filter(client: AsyncClient) -> No
         "limit": 50,
     }
     
-    response = await client.post("/api/v1/communes/search", json=search_request)
+    response = sync_client.post("/api/v1/communes/search", json=search_request)
     
     assert response.status_code == 200
     data = response.json()
     
     assert "communes" in data
+
+
+def test_search_communes_invalid_population_range(sync_client: TestClient) -> None:
+    """Test 422 when population_min is greater than population_max."""
+    search_request = {
+        "population_min": 500000,
+        "population_max": 100000,
+    }
+    
+    response = sync_client.post("/api/v1/communes/search", json=search_request)
+    
+    assert response.status_code == 422
@@ -0,0 +1,71 @@
+"""
+Tests for GeoJSON endpoints.
+
+Note: These tests work without actual commune data (shapefile).
+The API returns an empty FeatureCollection when no data is available.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_get_communes_geojson(sync_client: TestClient) -> None:
+    """Test GeoJSON endpoint returns a FeatureCollection."""
+    response = sync_client.get("/api/v1/geojson/communes")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/geo+json")
+
+    data = response.json()
+    assert data["type"] == "FeatureCollection"
+    assert isinstance(data["features"], list)
+
+
+def test_get_communes_geojson_gzip_refused(sync_client: TestClient) -> None:
+    """Test gzip is not used when the client gives it a zero quality."""
+    response = sync_client.get(
+        "/api/v1/geojson/communes",
+        headers={"Accept-Encoding": "gzip;q=0, identity"},
+    )
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.json()["type"] == "FeatureCollection"
+
+
+def test_get_communes_geojson_not_modified(sync_client: TestClient) -> None:
+    """Test conditional GET returns 304 when the ETag matches."""
+    response = sync_client.get("/api/v1/geojson/communes")
+    etag = response.headers["etag"]
+
+    response = sync_client.get(
+        "/api/v1/geojson/communes",
+        headers={"If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_get_communes_ndgeojson(sync_client: TestClient) -> None:
+    """Test streamed variant returns one feature per line (none without data)."""
+    response = sync_client.get("/api/v1/geojson/communes?format=ndgeojson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert all(line.startswith("{") for line in response.text.splitlines())
+
+
+def test_search_communes_geojson(sync_client: TestClient) -> None:
+    """Test filtered GeoJSON endpoint returns a FeatureCollection."""
+    search_request = {
+        "population_min": 1000,
+        "search_query": "paris",
+    }
+
+    response = sync_client.post("/api/v1/geojson/communes/search", json=search_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["type"] == "FeatureCollection"
+    assert isinstance(data["features"], list)
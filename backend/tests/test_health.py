@@ -2,14 +2,17 @@
 Tests for health check endpoint.
 """
 
-import pytest
-from httpx import AsyncClient
+import asyncio
 
+import orjson
+from fastapi.testclient import TestClient
 
-@pytest.mark.anyio
-async def test_health_check(client: AsyncClient) -> None:
+from app.api.v1.endpoints.health import health_check
+
+
+def test_health_check(sync_client: TestClient) -> None:
     """Test health check returns healthy status."""
-    response = await client.get("/api/v1/health")
+    response = sync_client.get("/api/v1/health")
     
     assert response.status_code == 200
     data = response.json()
@@ -18,12 +21,12 @@ async def test_health_check(client: AsyncClient) -> None:
     assert "version" in data
     assert "timestamp" in data
     assert "services" in data
+    assert response.headers["cache-control"] == "no-store"
 
 
-@pytest.mark.anyio
-async def test_root_endpoint(client: AsyncClient) -> None:
+def test_root_endpoint(sync_client: TestClient) -> None:
     """Test root endpoint returns API info."""
-    response = await client.get("/")
+    response = sync_client.get("/")
     
     assert response.status_code == 200
     data = response.json()
@@ -31,3 +34,13 @@ async def test_root_endpoint(client: AsyncClient) -> None:
     assert "name" in data
     assert "version" in data
     assert "docs" in data
+
+
+def test_health_check_documented_handler(sync_client: TestClient) -> None:
+    """Test the documented handler builds the same response as the served route."""
+    served = sync_client.get("/api/v1/health")
+    documented = asyncio.run(health_check())
+
+    assert documented.headers["cache-control"] == served.headers["cache-control"]
+    assert documented.media_type == served.headers["content-type"]
+    assert orjson.loads(documented.body).keys() == served.json().keys()
@@ -0,0 +1,151 @@
+"""
+Tests for the scoring service.
+
+The registry is replaced by a stub exposing only the filters list, so these
+tests do not need any data files.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.scoring_service import ScoringService
+
+
+def _make_filters(*filter_ids: str) -> list[SimpleNamespace]:
+    """Build a filters list (registry order) with default weight 50."""
+    return [SimpleNamespace(id=filter_id, weight_default=50) for filter_id in filter_ids]
+
+
+class _StubRegistry:
+    """Registry stub serving a replaceable filters list."""
+
+    def __init__(self, filters: list[SimpleNamespace]) -> None:
+        self.filters = filters
+
+    def get_available_filters(self) -> list[SimpleNamespace]:
+        return self.filters
+
+
+@pytest.fixture
+def service() -> ScoringService:
+    """Create a scoring service over a stub registry with three filters."""
+    scoring_service = ScoringService()
+    scoring_service.registry = _StubRegistry(_make_filters("a", "b", "c"))
+    return scoring_service
+
+
+def test_batch_scores_weighted_mean(service: ScoringService) -> None:
+    """Test batch scores are the weighted mean of positively weighted columns."""
+    score_matrix = np.array([[80, 20, 0], [40, 60, 100]], dtype=np.float32)
+
+    scores = service.calculate_global_scores_batch(score_matrix, {"a": 3, "b": 1, "c": 0})
+
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, [65.0, 45.0], rtol=1e-6)
+
+
+def test_batch_scores_neutral_without_weights(service: ScoringService) -> None:
+    """Test batch scores are neutral when no known filter has a positive weight."""
+    score_matrix = np.array([[80, 20, 0]], dtype=np.float32)
+
+    scores = service.calculate_global_scores_batch(score_matrix, {"a": 0, "unknown": 10})
+
+    np.testing.assert_array_equal(scores, [50.0])
+
+
+def test_fixed_weights_keep_float32(service: ScoringService) -> None:
+    """Test a float64 weight vector does not upcast the scores."""
+    score_matrix = np.array([[80, 20, 0]], dtype=np.float32)
+
+    scores = service.calculate_global_scores_with_fixed_weights(
+        score_matrix,
+        np.array([1.0, 1.0, 0.0]),
+    )
+
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, [50.0])
+
+
+def test_scorer_reused_for_same_weights(service: ScoringService) -> None:
+    """Test requests with the same weights share one cached scorer."""
+    score_matrix = np.array([[80, 20, 0]], dtype=np.float32)
+    service.calculate_global_scores_batch(score_matrix, {"a": 80, "b": 20})
+    scorer = service._get_scorer((("a", 80), ("b", 20)))
+
+    # Same weights, other insertion order
+    service.calculate_global_scores_batch(score_matrix, {"b": 20, "a": 80})
+
+    assert len(service._scorers) == 1
+    assert service._get_scorer((("a", 80), ("b", 20))) is scorer
+
+
+def test_scorer_cache_cleared_when_filters_change(service: ScoringService) -> None:
+    """Test scorers built for a previous filters list are dropped."""
+    weights_key = (("a", 80.0), ("b", 20.0))
+    service._refresh_filters()
+    scorer = service._get_scorer(weights_key)
+    assert service._get_scorer(weights_key) is scorer
+
+    # Filter "b" moves to another column
+    service.registry.filters = _make_filters("b", "a", "c")
+    service._refresh_filters()
+
+    assert not service._scorers
+    assert service._get_scorer(weights_key) is not scorer
+    scores = service.calculate_global_scores_batch(
+        np.array([[20, 80, 0]], dtype=np.float32),
+        dict(weights_key),
+    )
+    np.testing.assert_allclose(scores, [68.0], rtol=1e-6)
+
+
+def test_scorer_cache_per_instance(service: ScoringService) -> None:
+    """Test each service keeps its own bounded scorer cache."""
+    other = ScoringService()
+    other.registry = _StubRegistry(_make_filters("a", "b", "c"))
+    other._refresh_filters()
+    other._get_scorer((("a", 1.0),))
+    service._refresh_filters()
+
+    for weight in range(ScoringService.SCORER_CACHE_SIZE + 1):
+        service._get_scorer((("a", float(weight)),))
+
+    assert len(service._scorers) == ScoringService.SCORER_CACHE_SIZE
+    assert (("a", 0.0),) not in service._scorers
+    assert list(other._scorers) == [(("a", 1.0),)]
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [{}, {"a": 0, "b": 0}, {"a": -10}],
+    ids=["empty", "zero", "negative"],
+)
+def test_global_score_neutral_without_weights(
+    service: ScoringService,
+    weights: dict[str, float],
+) -> None:
+    """Test the scalar score is neutral when no weight is positive."""
+    assert service.calculate_global_score({"a": 80, "b": 20}, weights) == 50.0
+
+
+def test_global_score_ignores_missing_scores(service: ScoringService) -> None:
+    """Test weighted filters without a score are left out of the mean."""
+    assert service.calculate_global_score({"a": 80}, {"a": 1, "b": 3}) == 80.0
+    assert service.calculate_global_score({}, {"a": 1}) == 50.0
+
+
+def test_global_score_skips_non_finite_scores(service: ScoringService) -> None:
+    """Test NaN and infinite scores are left out of the mean."""
+    scores = {"a": 80.0, "b": float("nan"), "c": float("inf")}
+
+    assert service.calculate_global_score(scores, {"a": 1, "b": 1, "c": 1}) == 80.0
+
+
+def test_global_score_unrounded(service: ScoringService) -> None:
+    """Test the scalar score is returned unrounded (rounded when serialized)."""
+    score = service.calculate_global_score({"a": 10, "b": 20}, {"a": 2, "b": 1})
+
+    assert score == pytest.approx(40 / 3)
+    assert score != round(score, 1)